@@ -0,0 +1,101 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Sequence
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.linear_model import RidgeClassifier
+from threadpoolctl import threadpool_limits
+
+from snapshot_store import SNAPSHOT_DIR
+
+
+MAX_WORKERS = os.cpu_count() or 1
+
+
+@dataclass
+class BacktestResult:
+    """ Out-of-sample predictions of a walk-forward backtest, with per-fold accuracy and timing.
+
+    `predictions` has the notebook's `actual` / `prediction` columns, indexed like the
+    input frame. Each fold is a dict with 'season', 'train_rows', 'test_rows',
+    'accuracy' and 'seconds'.
+    """
+    predictions: pd.DataFrame
+    folds: List[dict] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def accuracy(self) -> float:
+        return float((self.predictions["actual"] == self.predictions["prediction"]).mean())
+
+
+def season_ranges(seasons: np.ndarray):
+    """ (season, start, end) row ranges of a season-sorted array.
+    """
+    values, starts = np.unique(seasons, return_index=True)
+    ends = np.append(starts[1:], len(seasons))
+    return list(zip(values.tolist(), starts.tolist(), ends.tolist()))
+
+
+def _run_fold(x_path, y_path, model, season, train_end, test_start, test_end):
+    started = time.perf_counter()
+    # Read-only views of the shared matrices; only the pages this fold touches are loaded
+    X = np.load(x_path, mmap_mode='r')
+    y = np.load(y_path, mmap_mode='r')
+    with threadpool_limits(1):  # one BLAS thread per worker, the folds are the parallelism
+        fitted = clone(model).fit(X[:train_end], y[:train_end])
+        predictions = fitted.predict(X[test_start:test_end])
+    actual = y[test_start:test_end]
+    return predictions, {'season': season, 'train_rows': train_end, 'test_rows': test_end - test_start,
+                         'accuracy': float((predictions == actual).mean()),
+                         'seconds': time.perf_counter() - started}
+
+
+def backtest(data: pd.DataFrame, predictors: Sequence[str], model=None, start: int = 2, step: int = 1,
+             max_workers: int = MAX_WORKERS) -> BacktestResult:
+    """ The notebook's season-by-season walk-forward backtest, with the folds run in parallel.
+
+    Fold i fits on every season before season i and predicts season i. The frame is
+    sorted by season once, so each fold's training set is a prefix of the same
+    matrix. The matrix is written once to a memory-mapped .npy file that every
+    worker process maps read-only, instead of pickling slices of it per fold.
+    `max_workers=0` runs the folds inline.
+    """
+    model = model if model is not None else RidgeClassifier(alpha=1)
+    started = time.perf_counter()
+    data = data.sort_values("season", kind="stable")
+    ranges = season_ranges(data["season"].to_numpy())
+    folds = [(season, test_start, test_start, test_end)
+             for season, test_start, test_end in ranges[start::step]]
+    if not folds:
+        return BacktestResult(pd.DataFrame(columns=["actual", "prediction"]))
+
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    workdir = tempfile.mkdtemp(prefix='backtest-', dir=SNAPSHOT_DIR)
+    try:
+        x_path, y_path = os.path.join(workdir, 'X.npy'), os.path.join(workdir, 'y.npy')
+        np.save(x_path, data[list(predictors)].to_numpy(float))
+        np.save(y_path, data["target"].to_numpy())
+        if max_workers <= 0:
+            results = [_run_fold(x_path, y_path, model, *fold) for fold in folds]
+        else:
+            with ProcessPoolExecutor(max_workers=min(max_workers, len(folds)),
+                                     mp_context=multiprocessing.get_context('spawn')) as pool:
+                futures = [pool.submit(_run_fold, x_path, y_path, model, *fold) for fold in folds]
+                results = [future.result() for future in futures]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    actual = data["target"]
+    predictions = pd.concat([
+        pd.DataFrame({"actual": actual.iloc[test_start:test_end],
+                      "prediction": fold_predictions}, index=data.index[test_start:test_end])
+        for (_, _, test_start, test_end), (fold_predictions, _) in zip(folds, results)])
+    return BacktestResult(predictions, [timing for _, timing in results], time.perf_counter() - started)
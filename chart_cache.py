@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from typing import Optional
+
+import matplotlib.pyplot as plt
+import pandas as pd
+from PIL import Image
+
+from snapshot_store import SNAPSHOT_DIR
+
+
+CHART_CACHE_DIR = os.environ.get('NBA_CHART_CACHE_DIR', os.path.join(SNAPSHOT_DIR, 'charts'))
+# Bump when the chart drawing code changes, so old images are not served
+CHART_STYLE_VERSION = 3
+# Same defaults st.pyplot uses when it encodes a figure
+SAVEFIG_KWARGS = {'bbox_inches': 'tight', 'dpi': 200}
+SHOT_COLUMNS = ('LOC_X', 'LOC_Y', 'SHOT_MADE_FLAG', 'PLAYER_ID')
+
+
+def data_fingerprint(df: pd.DataFrame, columns=SHOT_COLUMNS) -> str:
+    """ Content hash of the columns a chart is drawn from.
+    """
+    columns = [column for column in columns if column in df.columns]
+    hashed = pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+    return hashlib.sha1(hashed.tobytes()).hexdigest()
+
+
+def encode_figure(fig, fmt: str = 'png') -> bytes:
+    """ Encode a matplotlib figure and close it.
+    """
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png', **SAVEFIG_KWARGS)
+    plt.close(fig)
+    if fmt == 'png':
+        return buffer.getvalue()
+    converted = BytesIO()
+    Image.open(BytesIO(buffer.getvalue())).save(converted, format=fmt.upper(), lossless=True)
+    return converted.getvalue()
+
+
+class ChartCache:
+    """ Bounded two-tier LRU of rendered chart images.
+
+    Keys cover the player, seasons, chart type, drawing parameters and a fingerprint
+    of the shot data, so any change to the data or the request produces a new key.
+    Encoded images live in an in-memory LRU and on disk. Both tiers evict their least
+    recently used images once they exceed their size budget.
+    """
+
+    def __init__(self, root: str = CHART_CACHE_DIR, max_memory_bytes: int = 64 * 2**20,
+                 max_disk_bytes: int = 512 * 2**20, fmt: str = 'png'):
+        self.root = root
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.fmt = fmt
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = None
+        self._written_bytes = 0
+        self._evicting = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(player_id, seasons, chart: str, df: pd.DataFrame, **params) -> str:
+        payload = json.dumps({'player': player_id, 'seasons': list(seasons), 'chart': chart,
+                              'params': params, 'style': CHART_STYLE_VERSION,
+                              'data': data_fingerprint(df)}, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                return data
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)  # mark as recently used for disk eviction
+        except OSError:
+            return None
+        self._remember(key, data)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        self._remember(key, data)
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            return
+        with self._lock:
+            self._written_bytes += len(data)
+            if self._disk_bytes is not None:
+                self._disk_bytes += len(data)
+        self._evict_disk()
+
+    def _path(self, key):
+        return os.path.join(self.root, f"{key}.{self.fmt}")
+
+    def _remember(self, key, data):
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= len(previous)
+            self._memory[key] = data
+            self._memory_bytes += len(data)
+            while self._memory_bytes > self.max_memory_bytes and len(self._memory) > 1:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+
+    def _evict_disk(self):
+        # The directory is scanned and trimmed without the lock, so get() is never held up
+        # by disk I/O; images written meanwhile are added to the total afterwards
+        with self._lock:
+            if self._evicting or (self._disk_bytes is not None and self._disk_bytes <= self.max_disk_bytes):
+                return
+            self._evicting = True
+            written = self._written_bytes
+        try:
+            stats = []
+            try:
+                for entry in os.scandir(self.root):
+                    if entry.name.endswith(f".{self.fmt}"):
+                        stat = entry.stat()
+                        stats.append((stat.st_mtime, stat.st_size, entry.path))
+            except OSError:
+                return
+            stats.sort(reverse=True)
+            total = 0
+            for _, size, path in stats:
+                total += size
+                if total > self.max_disk_bytes:
+                    total -= size
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+            with self._lock:
+                self._disk_bytes = total + self._written_bytes - written
+        finally:
+            with self._lock:
+                self._evicting = False
+
+
+chart_cache = ChartCache()
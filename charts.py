@@ -0,0 +1,229 @@
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
+from chart_cache import SAVEFIG_KWARGS
+from court import add_court
+from hexbin import hex_grid
+from image_cache import image_cache
+from leaderboards import CATEGORIES, QUALIFIERS
+
+
+def generate_top_performers_plots(top_performers, category):
+    # `top_performers` is the category's leaderboard (LeaderboardIndex.top), best first
+    # Check if the selected category is valid (this runs in a render worker, so the
+    # caller reports the error)
+    if category not in CATEGORIES:
+        raise ValueError(f"Invalid category selected: {category}")
+
+    column_name = CATEGORIES[category]
+    # Percentages are fractions, so they need more decimals than per-game counts
+    value_format = '.3f' if column_name in QUALIFIERS else '.1f'
+
+    sns.set_style("white")
+    fig, ax = plt.subplots(figsize=(10, 4))  # Create a figure and a set of subplots
+
+    # Plotting the top performers
+    sns.barplot(x=column_name, y='Player', data=top_performers, palette='viridis', ax=ax)
+    
+    # Centering the title and setting font size
+    ax.set_title(f'Top Performers in {category}', loc='center', fontsize=16)
+
+    # Setting x and y labels with specified font sizes
+    ax.set_xlabel(category, fontsize=14)
+    ax.set_ylabel('Player', fontsize=14)
+
+    # Annotate each bar with the value
+    for p in ax.patches:
+        ax.annotate(format(p.get_width(), value_format),
+                    (p.get_width(), p.get_y() + p.get_height() / 2),  # Position
+                    xytext=(5, 0),  # 5 points horizontal offset
+                    textcoords='offset points',  # Offset from the xy value
+                    ha='left', va='center')  # Horizontal alignment and vertical alignment
+
+    plt.tight_layout()
+    return fig 
+
+
+class ShotCharts:
+        def __init__(self) -> None:
+                pass
+        
+        def create_court(ax: mpl.axes, color="white") -> mpl.axes:
+                """ Create a basketball court in a matplotlib axes
+                The lines are rasterized once per (color, size, dpi) and composited as one image
+                """
+                ax = add_court(ax, color, dpi=SAVEFIG_KWARGS['dpi'])
+                # Remove ticks
+                ax.set_xticks([])
+                ax.set_yticks([])
+                # Set axis limits
+                ax.set_xlim(-250, 250)
+                ax.set_ylim(0, 470)
+                return ax
+        
+        def add_headshot(fig: plt.figure, id: int) -> plt.figure:
+       
+            headshot_url = f"https://ak-static.cms.nba.com/wp-content/uploads/headshots/nba/latest/260x190/{id}.png"
+            
+            try:
+                # Served from the shared image cache; None if missing or not an image
+                img = image_cache.get_image(headshot_url)
+                
+                if img is not None:
+                    ax = fig.add_axes([0.06, 0.01, 0.3, 0.3], anchor='SW')
+                    ax.imshow(img)
+                    ax.axis('off')
+                else:
+                    print(f"No headshot image available from {headshot_url}.")
+            except Exception as e:
+                print(f"An error occurred: {e}")
+
+            return fig
+                
+        #def add_headshot(fig: plt.figure, id: int) -> plt.figure:
+                #headshot_path = "https://github.com/ubiratanfilho/HotShot/blob/main/data/nba/raw/headshots/"+ str(id) +".png?raw=true" 
+                #im = plt.imread(headshot_path)
+                #ax = fig.add_axes([0.06, 0.01, 0.3, 0.3], anchor='SW')
+                #ax.imshow(im)
+                #ax.axis('off')
+                #return fig
+        
+        def frequency_chart(df: pd.DataFrame, name: str, season=None, extent=(-250, 250, 422.5, -47.5),
+                                gridsize=25, cmap="inferno"):
+                """ Create a shot chart of a player's shot frequency and accuracy
+                """ 
+                # bin every shot once; attempts and makes per hexbin zone come from the same pass
+                grid = hex_grid(extent, gridsize)
+                shots_by_hex, makes_by_hex = grid.attempts_and_makes(
+                        df.LOC_X, df.LOC_Y + 60, df.SHOT_MADE_FLAG == 1)
+                freq_by_hex = shots_by_hex / shots_by_hex.sum()
+                
+                # field goal % per hexbin zone, zeroed for zones with fewer than 5 shots
+                filter_threshold = 5
+                pcts_by_hex = np.divide(makes_by_hex, shots_by_hex, out=np.zeros(grid.n),
+                                        where=shots_by_hex >= filter_threshold)
+                x, y = grid.centers[:, 0], grid.centers[:, 1]
+                z = pcts_by_hex
+                sizes = freq_by_hex * 1000
+                
+                # Create figure and axes
+                fig = plt.figure(figsize=(3.6, 3.6), facecolor='black', edgecolor='black', dpi=100)
+                ax = fig.add_axes([0, 0, 1, 1], facecolor='black')
+                plt.xlim(250, -250)
+                plt.ylim(-47.5, 422.5)
+                # Plot hexbins
+                scatter = ax.scatter(x, y, c=z, cmap=cmap, marker='h', s=sizes)
+                # Draw court
+                ax = ShotCharts.create_court(ax)
+                # Add legends
+                max_freq = max(freq_by_hex)
+                max_size = max(sizes)
+                legend_acc = plt.legend(
+                *scatter.legend_elements(num=5, fmt="{x:.0f}%",
+                                        func=lambda x: x * 100),
+                loc=[0.85,0.785], title='Shot %', fontsize=6)
+                legend_freq = plt.legend(
+                *scatter.legend_elements(
+                        'sizes', num=5, alpha=0.8, fmt="{x:.1f}%"
+                        , func=lambda s: s / max_size * max_freq * 100
+                ),
+                loc=[0.68,0.785], title='Freq %', fontsize=6)
+                plt.gca().add_artist(legend_acc)
+                # Add title
+                plt.text(-250, 450, f"{name}", fontsize=21, color='white',
+                        fontname='Arial')
+                plt.text(-250, 420, "Frequency and FG%", fontsize=12, color='white',
+                        fontname='Arial')
+                season = f"{season[0][:4]}-{season[-1][-2:]}"
+                plt.text(-250, -20, season, fontsize=8, color='white')
+                #plt.text(110, -20, '@hotshot_nba', fontsize=8, color='white')
+                
+                # add headshot
+                fig = ShotCharts.add_headshot(fig, df.PLAYER_ID.iloc[0])
+
+                return fig
+        
+        def volume_chart(df: pd.DataFrame, name: str, season=None, 
+                        RA=True,
+                        extent=(-250, 250, 422.5, -47.5),
+                        gridsize=25, cmap="plasma"):
+                fig = plt.figure(figsize=(3.6, 3.6), facecolor='black', edgecolor='black', dpi=100)
+                ax = fig.add_axes([0, 0, 1, 1], facecolor='black')
+
+                # Plot hexbin of shots
+                if RA == True:
+                        x = df.LOC_X
+                        y = df.LOC_Y + 60
+                        # Annotate player name and season
+                        plt.text(-250, 440, f"{name}", fontsize=21, color='white',
+                                fontname='Arial')
+                        plt.text(-250, 410, "Shot Volume", fontsize=12, color='white',
+                                fontname='Arial')
+                        season = f"{season[0][:4]}-{season[-1][-2:]}"
+                        plt.text(-250, -20, season, fontsize=8, color='white')
+                        #plt.text(110, -20, '@hotshot_nba', fontsize=8, color='white')
+                else:
+                        cond = ~((-45 < df.LOC_X) & (df.LOC_X < 45) & (-40 < df.LOC_Y) & (df.LOC_Y < 45))
+                        x = df.LOC_X[cond]
+                        y = df.LOC_Y[cond] + 60
+                        # Annotate player name and season
+                        plt.text(-250, 440, f"{name}", fontsize=21, color='white',
+                                fontname='Arial')
+                        plt.text(-250, 410, "Shot Volume", fontsize=12, color='white',
+                                fontname='Arial')
+                        plt.text(-250, 385, "(w/o restricted area)", fontsize=10, color='red')
+                        season = f"{season[0][:4]}-{season[-1][-2:]}"
+                        plt.text(-250, -20, season, fontsize=8, color='white')
+                        #plt.text(110, -20, '@hotshot_nba', fontsize=8, color='white')
+                        
+                # bin the shots with the shared hex grid and draw only hexes with 2+ shots
+                grid = hex_grid(extent, gridsize)
+                hexbin = grid.draw(ax, grid.counts(x, y), mincnt=2, cmap=cmap, norm=mpl.colors.LogNorm())
+
+                # Draw court
+                ax = ShotCharts.create_court(ax, 'white')
+
+                # add colorbar, drawn from the hexbin's own colormap and log normalization
+                if hexbin.get_array().size:
+                        newax = fig.add_axes([0.62, 0.88, 0.33, 0.03], zorder=1)
+                        colorbar = fig.colorbar(hexbin, cax=newax, orientation='horizontal')
+                        vmin, vmax = hexbin.norm.vmin, hexbin.norm.vmax
+                        colorbar.set_ticks([vmin, vmax], labels=['Low', 'High'])
+                        colorbar.minorticks_off()
+                        colorbar.outline.set_edgecolor('white')
+                        newax.tick_params(colors='white', labelsize=7, length=0)
+                        newax.set_title(f"Shots per zone ({vmin:.0f}-{vmax:.0f})", color='white', fontsize=7)
+                
+                
+                # add headshot
+                fig = ShotCharts.add_headshot(fig, df.PLAYER_ID.iloc[0])
+
+                return fig
+        
+        def makes_misses_chart(df: pd.DataFrame, name: str, season=None):
+                # Create figure and axes
+                fig = plt.figure(figsize=(3.6, 3.6), facecolor='black', edgecolor='black', dpi=100)
+                ax = fig.add_axes([0, 0, 1, 1], facecolor='black')
+
+                plt.text(-250, 450, f"{name}", fontsize=21, color='white',
+                        fontname='Arial')
+                plt.text(-250, 425, "Misses", fontsize=12, color='red',
+                        fontname='Arial')
+                plt.text(-170, 425, "&", fontsize=12, color='white',
+                        fontname='Arial')
+                plt.text(-150, 425, "Buckets", fontsize=12, color='green',
+                        fontname='Arial')
+                season = f"{season[0][:4]}-{season[-1][-2:]}"
+                plt.text(-250, -20, season, fontsize=8, color='white')
+                #plt.text(110, -20, '@hotshot_nba', fontsize=8, color='white')
+
+                ax = ShotCharts.create_court(ax, 'white')
+                sc = ax.scatter(df.LOC_X, df.LOC_Y + 60, c=df.SHOT_MADE_FLAG, cmap='RdYlGn', s=12)
+                
+                # add headshot
+                fig = ShotCharts.add_headshot(fig, df.PLAYER_ID.iloc[0])
+
+                return fig
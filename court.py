@@ -0,0 +1,67 @@
+from functools import lru_cache
+
+import matplotlib as mpl
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+
+COURT_LIMITS = (-250, 250, 0, 470)
+
+
+def draw_court(ax: mpl.axes, color="white") -> mpl.axes:
+    """ Draw the half-court lines as vector artists on a matplotlib axes
+    """
+    # Short corner 3PT lines
+    ax.plot([-220, -220], [0, 140], linewidth=2, color=color)
+    ax.plot([220, 220], [0, 140], linewidth=2, color=color)
+    # 3PT Arc
+    ax.add_artist(mpl.patches.Arc((0, 140), 440, 315, theta1=0, theta2=180, facecolor='none', edgecolor=color, lw=2))
+    # Lane and Key
+    ax.plot([-80, -80], [0, 190], linewidth=2, color=color)
+    ax.plot([80, 80], [0, 190], linewidth=2, color=color)
+    ax.plot([-60, -60], [0, 190], linewidth=2, color=color)
+    ax.plot([60, 60], [0, 190], linewidth=2, color=color)
+    ax.plot([-80, 80], [190, 190], linewidth=2, color=color)
+    ax.add_artist(mpl.patches.Circle((0, 190), 60, facecolor='none', edgecolor=color, lw=2))
+    ax.plot([-250, 250], [0, 0], linewidth=4, color='white')
+    # Rim
+    ax.add_artist(mpl.patches.Circle((0, 60), 15, facecolor='none', edgecolor=color, lw=2))
+    # Backboard
+    ax.plot([-30, 30], [40, 40], linewidth=2, color=color)
+    return ax
+
+
+@lru_cache(maxsize=32)
+def court_template(color="white", size=(3.6, 3.6), dpi=200, limits=COURT_LIMITS) -> np.ndarray:
+    """ The court lines rasterized once onto a transparent RGBA image.
+
+    `size` is the size in inches of the axes the template will fill, and `dpi` the
+    resolution it will be saved at, so the template maps pixel for pixel onto the chart.
+    """
+    # Figure + Agg canvas directly, so the template never touches pyplot's global state
+    fig = Figure(figsize=size, dpi=dpi)
+    FigureCanvasAgg(fig)
+    fig.patch.set_alpha(0)
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.patch.set_alpha(0)
+    ax.axis('off')
+    draw_court(ax, color)
+    ax.set_xlim(limits[0], limits[1])
+    ax.set_ylim(limits[2], limits[3])
+    fig.canvas.draw()
+    template = np.asarray(fig.canvas.buffer_rgba()).copy()
+    template.flags.writeable = False
+    return template
+
+
+def add_court(ax: mpl.axes, color="white", dpi=200, limits=COURT_LIMITS) -> mpl.axes:
+    """ Composite the cached court template onto `ax` as a single image artist
+    """
+    fig = ax.get_figure()
+    position = ax.get_position()
+    size = (round(position.width * fig.get_figwidth(), 4), round(position.height * fig.get_figheight(), 4))
+    # Above the data layer (collections are zorder 1-2) and below text and legends
+    ax.imshow(court_template(color, size, dpi, tuple(limits)), extent=limits, origin='upper',
+              aspect='auto', interpolation='antialiased', zorder=2.5)
+    return ax
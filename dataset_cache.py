@@ -0,0 +1,168 @@
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from io import StringIO
+from typing import Optional
+
+import pandas as pd
+import requests
+from requests.exceptions import RequestException
+
+from snapshot_store import snapshot_store
+
+
+DATASET_URL = 'https://nba-api-ash-1-fc1674476d71.herokuapp.com/dataset'
+FALLBACK_CSV = './Sample_Data/NBA_2024_per_game.csv'
+SNAPSHOT_NAME = 'dataset'
+
+
+@dataclass(frozen=True)
+class DatasetSnapshot:
+    """ One parsed version of the season dataset.
+
+    The DataFrame is shared by every session, so callers must treat it as read-only.
+    """
+    df: pd.DataFrame
+    version: str
+    source: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float = 0.0
+
+
+class DatasetCache:
+    """ Process-wide cache of the `/dataset` pull, revalidated with conditional requests.
+
+    Every Streamlit session and rerun shares the same snapshot until the TTL expires.
+    After that, one request revalidates it with ETag / If-Modified-Since, and the
+    DataFrame is only re-parsed when the upstream payload actually changed. When the
+    API is unreachable, the last good API snapshot is kept (in memory, or the copy
+    persisted in the snapshot store by an earlier process), or the sample CSV is used.
+    """
+
+    def __init__(self, ttl: float = 300, fallback_path: str = FALLBACK_CSV, timeout: float = 30):
+        self.ttl = ttl
+        self.fallback_path = fallback_path
+        self.timeout = timeout
+        self._snapshots = {}
+        self._checked_at = {}
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def get(self, api_url: str = DATASET_URL) -> DatasetSnapshot:
+        """ Return the current snapshot for `api_url`, refreshing it if the TTL expired.
+        """
+        snapshot = self._fresh_snapshot(api_url)
+        if snapshot is not None:
+            return snapshot
+
+        # Only one thread refreshes a given URL; the others wait and reuse its result
+        with self._lock_for(api_url):
+            snapshot = self._fresh_snapshot(api_url)
+            if snapshot is not None:
+                return snapshot
+            snapshot = self._refresh(api_url, self._snapshots.get(api_url))
+            self._snapshots[api_url] = snapshot
+            self._checked_at[api_url] = time.monotonic()
+            return snapshot
+
+    def invalidate(self, api_url: Optional[str] = None) -> None:
+        """ Force the next `get` to revalidate one URL, or every URL if none is given.
+        """
+        if api_url is None:
+            self._checked_at.clear()
+        else:
+            self._checked_at.pop(api_url, None)
+
+    def _fresh_snapshot(self, api_url):
+        snapshot = self._snapshots.get(api_url)
+        checked_at = self._checked_at.get(api_url)
+        if snapshot is None or checked_at is None:
+            return None
+        if time.monotonic() - checked_at >= self.ttl:
+            return None
+        return snapshot
+
+    def _lock_for(self, api_url):
+        with self._locks_guard:
+            return self._locks.setdefault(api_url, threading.Lock())
+
+    def _refresh(self, api_url, previous):
+        headers = {}
+        if previous is not None and previous.source == 'api':
+            if previous.etag:
+                headers['If-None-Match'] = previous.etag
+            if previous.last_modified:
+                headers['If-Modified-Since'] = previous.last_modified
+
+        try:
+            response = requests.get(api_url, headers=headers, timeout=self.timeout)
+        except RequestException:
+            response = None
+
+        if response is not None and response.status_code == 304 and previous is not None:
+            return previous
+
+        if response is not None and response.status_code == 200:
+            version = 'api-' + hashlib.sha1(response.content).hexdigest()[:12]
+            # Servers that ignore conditional headers still send identical bytes
+            if previous is not None and previous.version == version:
+                return previous
+            df = pd.DataFrame(pd.read_json(StringIO(response.json())))
+            snapshot_store.put_frame(SNAPSHOT_NAME, df, version)
+            return DatasetSnapshot(df, version, 'api',
+                                   etag=response.headers.get('ETag'),
+                                   last_modified=response.headers.get('Last-Modified'),
+                                   fetched_at=time.time())
+
+        # Upstream unavailable: keep serving the last good API snapshot if we have one
+        if previous is not None and previous.source == 'api':
+            return previous
+        if previous is None:
+            stored = snapshot_store.get_frame(SNAPSHOT_NAME)
+            if stored is not None:
+                df, version = stored
+                return DatasetSnapshot(df, version, 'api', fetched_at=time.time())
+        return self._load_fallback(previous)
+
+    def _load_fallback(self, previous):
+        version = 'csv-' + snapshot_store.version(self.fallback_path)
+        if previous is not None and previous.version == version:
+            return previous
+        df = snapshot_store.read_csv(self.fallback_path)
+        return DatasetSnapshot(df, version, 'fallback', fetched_at=time.time())
+
+
+class VersionedCache:
+    """ Holds one derived object (index, table, ...) per key for the latest data version.
+
+    `get` returns the cached value while the version is unchanged and rebuilds it once,
+    under a lock, when the version moves on; older versions are dropped.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, version: str, build):
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                return entry[1]
+            value = build()
+            self._entries[key] = (version, value)
+            return value
+
+
+dataset_cache = DatasetCache()
+derived_cache = VersionedCache()
+
+
+def get_dataset(api_url: str = DATASET_URL) -> DatasetSnapshot:
+    """ Get the shared, versioned snapshot of the season dataset.
+    """
+    return dataset_cache.get(api_url)
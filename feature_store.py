@@ -0,0 +1,146 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+ROLLING_WINDOW = 10
+# Running sums are recomputed from the window this often, so float error cannot accumulate
+RESUM_EVERY = 64 * ROLLING_WINDOW
+
+
+def rolling_means(df: pd.DataFrame, columns: Sequence[str], window: int = ROLLING_WINDOW) -> pd.DataFrame:
+    """ Each team's `window`-game rolling means within a season, as `<col>_<window>` columns.
+
+    One vectorized `groupby().rolling()` pass over the whole game log, aligned with `df`;
+    rows before a team's `window`-th game of the season are NaN. Used for batch rebuilds.
+    """
+    # Grouping by arrays, not Series, keeps a rolled `season` column from being taken as a key
+    rolling = (df[list(columns)].groupby([df["team"].to_numpy(), df["season"].to_numpy()], sort=False)
+               .rolling(window).mean()
+               .reset_index(level=[0, 1], drop=True)
+               .sort_index())
+    rolling.columns = [f"{column}_{window}" for column in columns]
+    return rolling
+
+
+class _TeamState:
+    __slots__ = ('season', 'buffer', 'sums', 'count')
+
+    def __init__(self, season, window, width):
+        self.season = season
+        self.buffer = np.zeros((window, width))
+        self.sums = np.zeros(width)
+        self.count = 0
+
+
+class RollingFeatureStore:
+    """ Per-team rolling-window state for the prediction features, updated one game at a time.
+
+    Each team keeps a ring buffer of its last `window` games this season and their
+    running sums, so `update` is O(1) in the number of past games. A team's feature
+    vector is its latest game row plus its rolling means (`<col>_<window>`), taken
+    from the latest game that had a full window, which is the row the batch pipeline
+    keeps after `dropna`. Incoming rows are raw game-log rows; columns listed in
+    `scaler_columns` are scaled with the training MinMaxScaler (x * scale + min).
+    """
+
+    def __init__(self, columns: Sequence[str], window: int = ROLLING_WINDOW,
+                 scaler_columns: Sequence[str] = (), scaler_min=(), scaler_scale=()):
+        self.columns = list(columns)
+        self.window = window
+        self.feature_names = self.columns + [f"{column}_{window}" for column in self.columns]
+        position = {column: i for i, column in enumerate(self.columns)}
+        scaled = [(position[column], lo, scale)
+                  for column, lo, scale in zip(scaler_columns, scaler_min, scaler_scale)
+                  if column in position]
+        self._scaled_index = np.array([i for i, _, _ in scaled], int)
+        self._scaled_min = np.array([lo for _, lo, _ in scaled], float)
+        self._scaled_scale = np.array([scale for _, _, scale in scaled], float)
+        self._states: Dict[str, _TeamState] = {}
+        self._features: Dict[str, np.ndarray] = {}
+        self.last_date: Dict[str, str] = {}
+
+    def scale(self, values: np.ndarray) -> np.ndarray:
+        values = np.array(values, float)
+        values[..., self._scaled_index] = values[..., self._scaled_index] * self._scaled_scale + self._scaled_min
+        return values
+
+    def update(self, row) -> None:
+        """ Add one finished game (a mapping with team, season, date and the rolled columns).
+        """
+        team, season = row['team'], row['season']
+        values = self.scale([row[column] for column in self.columns])
+        state = self._states.get(team)
+        if state is None or state.season != season:
+            state = self._states[team] = _TeamState(season, self.window, len(self.columns))
+
+        slot = state.count % self.window
+        if state.count >= self.window:
+            state.sums -= state.buffer[slot]
+        state.buffer[slot] = values
+        state.sums += values
+        state.count += 1
+        if state.count % RESUM_EVERY == 0:
+            state.sums = state.buffer.sum(axis=0)
+
+        self.last_date[team] = row['date']
+        if state.count >= self.window:
+            self._features[team] = np.concatenate([values, state.sums / self.window])
+
+    def update_many(self, games: pd.DataFrame) -> None:
+        """ Add several finished games, in date order.
+        """
+        for row in games.sort_values("date", kind="stable").to_dict('records'):
+            self.update(row)
+
+    @property
+    def teams(self) -> List[str]:
+        return list(self._features)
+
+    def feature_vector(self, team: str) -> Optional[pd.Series]:
+        """ Current features of `team`, named like the pipeline's columns; None before its first full window.
+        """
+        features = self._features.get(team)
+        if features is None:
+            return None
+        return pd.Series(features, index=self.feature_names)
+
+    def team_features(self, columns: Sequence[str], teams: Iterable[str] = None) -> Tuple[List[str], np.ndarray]:
+        """ (teams, matrix) of the requested feature columns, one row per team.
+        """
+        teams = [team for team in (self.teams if teams is None else teams) if team in self._features]
+        index = {name: i for i, name in enumerate(self.feature_names)}
+        picked = [index[column] for column in columns]
+        if not teams:
+            return [], np.empty((0, len(picked)))
+        return teams, np.stack([self._features[team] for team in teams])[:, picked]
+
+    @classmethod
+    def from_games(cls, games: pd.DataFrame, columns: Sequence[str], window: int = ROLLING_WINDOW,
+                   scaler_columns: Sequence[str] = (), scaler_min=(), scaler_scale=()) -> 'RollingFeatureStore':
+        """ Batch rebuild (backfill) from a whole raw game log with one vectorized rolling pass.
+        """
+        store = cls(columns, window, scaler_columns, scaler_min, scaler_scale)
+        df = games.sort_values("date", kind="stable").reset_index(drop=True)
+        df[store.columns] = store.scale(df[store.columns].to_numpy(float))
+        means = rolling_means(df, store.columns, window)
+        complete = means.notna().all(axis=1)
+
+        latest = df.loc[complete].groupby("team").tail(1).index
+        for i in latest:
+            store._features[df.at[i, "team"]] = np.concatenate(
+                [df.loc[i, store.columns].to_numpy(float), means.loc[i].to_numpy(float)])
+
+        # Seed each team's ring buffer with the tail of its latest season
+        for team, rows in df.groupby("team", sort=False):
+            season_rows = rows[rows["season"] == rows["season"].iloc[-1]]
+            state = store._states[team] = _TeamState(season_rows["season"].iloc[-1], window, len(store.columns))
+            state.count = len(season_rows)
+            values = season_rows[store.columns].to_numpy(float)[-window:]
+            first = state.count - len(values)
+            for offset, game in enumerate(values):
+                state.buffer[(first + offset) % window] = game
+            state.sums = values.sum(axis=0)
+            store.last_date[team] = rows["date"].iloc[-1]
+        return store
@@ -0,0 +1,190 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from requests.exceptions import RequestException
+
+from shot_data import retrying_session
+
+
+HEADSHOT_URL = 'https://ak-static.cms.nba.com/wp-content/uploads/headshots/nba/latest/260x190/{id}.png'
+HEADSHOT_DIR = os.environ.get('NBA_HEADSHOT_DIR', '../data/nba/transient/headshots/')
+MANIFEST_NAME = 'manifest.jsonl'
+
+
+@dataclass
+class DownloadReport:
+    """ Per-file results of a bulk download and its aggregate throughput.
+
+    Each result has 'id', 'status' ('downloaded', 'unchanged', 'missing', 'skipped'
+    or 'failed'), 'bytes' and 'seconds'.
+    """
+    results: list = field(default_factory=list)
+    seconds: float = 0.0
+
+    def count(self, status: str) -> int:
+        return sum(1 for result in self.results if result['status'] == status)
+
+    @property
+    def bytes(self) -> int:
+        return sum(result['bytes'] for result in self.results)
+
+    @property
+    def files_per_second(self) -> float:
+        return len(self.results) / self.seconds if self.seconds else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes / self.seconds if self.seconds else 0.0
+
+    def summary(self) -> str:
+        statuses = ('downloaded', 'unchanged', 'missing', 'skipped', 'failed')
+        counts = ', '.join(f"{self.count(status)} {status}" for status in statuses)
+        return (f"{len(self.results)} headshots in {self.seconds:.1f}s ({counts}); "
+                f"{self.files_per_second:.1f} files/s, {self.bytes_per_second / 1024:.0f} KiB/s")
+
+
+class HeadshotDownloader:
+    """ Bulk, resumable headshot downloads over a bounded thread pool.
+
+    Every finished id is appended to a manifest in `output_dir`, with its ETag and
+    Last-Modified. Ids checked less than `max_age` seconds ago are skipped, so an
+    interrupted run picks up where it stopped. Older files are revalidated with a
+    conditional request and only rewritten when the server sends a new image.
+    """
+
+    def __init__(self, output_dir: str = HEADSHOT_DIR, url_template: str = HEADSHOT_URL,
+                 max_workers: int = 16, timeout: float = 30):
+        self.output_dir = output_dir
+        self.url_template = url_template
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+        self._manifest = None
+        self._lock = threading.Lock()
+        self._session = None
+
+    def download_all(self, ids: Iterable[int], max_age: float = 24 * 60 * 60) -> DownloadReport:
+        """ Download (or revalidate) the headshot of every id; `max_age=0` rechecks them all.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        manifest = self.manifest()
+        self._session = retrying_session(self.max_workers)
+        started = time.perf_counter()
+        now = time.time()
+        report = DownloadReport()
+        todo = []
+        for player_id in dict.fromkeys(ids):
+            entry = manifest.get(str(player_id))
+            if entry and now - entry['checked_at'] < max_age and self._is_present(player_id, entry):
+                report.results.append({'id': player_id, 'status': 'skipped', 'bytes': 0, 'seconds': 0.0})
+            else:
+                todo.append(player_id)
+
+        if todo:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(todo))) as pool:
+                report.results.extend(pool.map(self.download_one, todo))
+        self._compact()
+        report.seconds = time.perf_counter() - started
+        return report
+
+    def download_one(self, player_id: int) -> dict:
+        """ Fetch one headshot unless the stored copy is current, and record it in the manifest.
+        """
+        started = time.perf_counter()
+        os.makedirs(self.output_dir, exist_ok=True)
+        entry = self.manifest().get(str(player_id), {})
+        path = self.path(player_id)
+        headers = {}
+        if entry.get('status') == 200 and os.path.exists(path):
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        session = self._session or retrying_session(1)
+        try:
+            response = session.get(self.url_template.format(id=player_id), headers=headers,
+                                   timeout=self.timeout)
+        except RequestException:
+            return {'id': player_id, 'status': 'failed', 'bytes': 0,
+                    'seconds': time.perf_counter() - started}
+
+        size = 0
+        if response.status_code == 304 and headers:
+            status = 'unchanged'
+            self._record(player_id, dict(entry, checked_at=time.time()))
+        elif response.status_code in (403, 404):
+            # The CDN answers 403 for ids it has no image for
+            status = 'missing'
+            self._record(player_id, {'status': 404, 'checked_at': time.time()})
+        elif response.status_code == 200 and response.headers.get('Content-Type', 'image/').startswith('image/'):
+            status = 'downloaded'
+            size = len(response.content)
+            self._write(path, response.content)
+            self._record(player_id, {'status': 200, 'checked_at': time.time(), 'bytes': size,
+                                     'etag': response.headers.get('ETag'),
+                                     'last_modified': response.headers.get('Last-Modified')})
+        else:
+            status = 'failed'
+        return {'id': player_id, 'status': status, 'bytes': size,
+                'seconds': time.perf_counter() - started}
+
+    def path(self, player_id: int) -> str:
+        return os.path.join(self.output_dir, f"{player_id}.png")
+
+    def manifest(self) -> dict:
+        """ Latest manifest entry per id (as a string), read from disk once.
+        """
+        with self._lock:
+            if self._manifest is None:
+                self._manifest = {}
+                try:
+                    with open(self._manifest_path) as f:
+                        for line in f:
+                            try:
+                                record = json.loads(line)
+                            except ValueError:
+                                # A run killed mid-write leaves a truncated last line
+                                continue
+                            self._manifest[str(record.pop('id'))] = record
+                except OSError:
+                    pass
+            return self._manifest
+
+    def _is_present(self, player_id, entry):
+        return entry.get('status') != 200 or os.path.exists(self.path(player_id))
+
+    def _record(self, player_id, entry):
+        # Appending one line per finished id keeps the manifest current if the run is killed
+        line = json.dumps(dict(entry, id=player_id)) + '\n'
+        with self._lock:
+            self._manifest[str(player_id)] = entry
+            with open(self._manifest_path, 'a') as f:
+                f.write(line)
+
+    def _compact(self):
+        with self._lock:
+            lines = ''.join(json.dumps(dict(entry, id=int(key))) + '\n'
+                            for key, entry in self._manifest.items())
+        self._write(self._manifest_path, lines.encode('utf-8'))
+
+    @staticmethod
+    def _write(path, data):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+def download_headshots(ids: Iterable[int], output_dir: Optional[str] = None,
+                       max_age: float = 24 * 60 * 60, **kwargs) -> DownloadReport:
+    """ Download the headshots of `ids` into `output_dir`; the report carries the throughput summary.
+    """
+    downloader = HeadshotDownloader(output_dir or HEADSHOT_DIR, **kwargs)
+    return downloader.download_all(ids, max_age=max_age)
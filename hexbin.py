@@ -0,0 +1,104 @@
+import math
+from functools import lru_cache
+
+import matplotlib as mpl
+import matplotlib.collections as mcoll
+import matplotlib.transforms as mtransforms
+import numpy as np
+
+
+COURT_EXTENT = (-250, 250, 422.5, -47.5)
+
+
+class HexGrid:
+    """ Hexagon geometry for a fixed extent and gridsize, laid out exactly like `plt.hexbin`.
+
+    Centers and the hexagon polygon are computed once; binning a set of shots is then
+    one vectorized nearest-center pass plus a `bincount`. The extent may list y
+    top-first, as the shot charts do, in which case the rows are laid out downwards.
+    """
+
+    def __init__(self, extent=COURT_EXTENT, gridsize=25):
+        xmin, xmax, ymin, ymax = extent
+        self.nx = gridsize
+        self.ny = int(gridsize / math.sqrt(3))
+        self.nx1, self.ny1 = self.nx + 1, self.ny + 1
+        self.n1 = self.nx1 * self.ny1
+        self.n = self.n1 + self.nx * self.ny
+
+        # Same padding as matplotlib, to avoid roundoff at the x edges
+        padding = 1.e-9 * (xmax - xmin)
+        self.xmin = xmin - padding
+        self.ymin = ymin
+        self.sx = (xmax + padding - self.xmin) / self.nx
+        self.sy = (ymax - ymin) / self.ny
+
+        centers = np.zeros((self.n, 2), float)
+        centers[:self.n1, 0] = np.repeat(np.arange(self.nx1), self.ny1)
+        centers[:self.n1, 1] = np.tile(np.arange(self.ny1), self.nx1)
+        centers[self.n1:, 0] = np.repeat(np.arange(self.nx) + 0.5, self.ny)
+        centers[self.n1:, 1] = np.tile(np.arange(self.ny), self.nx) + 0.5
+        centers[:, 0] = centers[:, 0] * self.sx + self.xmin
+        centers[:, 1] = centers[:, 1] * self.sy + self.ymin
+        centers.flags.writeable = False
+        self.centers = centers
+        self.polygon = [self.sx, self.sy / 3] * np.array(
+            [[.5, -.5], [.5, .5], [0., 1.], [-.5, .5], [-.5, -.5], [0., -1.]])
+
+    def index(self, x, y) -> np.ndarray:
+        """ Hexagon index of every point; points outside the grid get `self.n`.
+        """
+        ix = (np.asarray(x, float) - self.xmin) / self.sx
+        iy = (np.asarray(y, float) - self.ymin) / self.sy
+        ix1 = np.round(ix).astype(int)
+        iy1 = np.round(iy).astype(int)
+        ix2 = np.floor(ix).astype(int)
+        iy2 = np.floor(iy).astype(int)
+        i1 = np.where((0 <= ix1) & (ix1 < self.nx1) & (0 <= iy1) & (iy1 < self.ny1),
+                      ix1 * self.ny1 + iy1, self.n)
+        i2 = np.where((0 <= ix2) & (ix2 < self.nx) & (0 <= iy2) & (iy2 < self.ny),
+                      self.n1 + ix2 * self.ny + iy2, self.n)
+        # Each point belongs to whichever of its two candidate centers is nearer
+        d1 = (ix - ix1) ** 2 + 3.0 * (iy - iy1) ** 2
+        d2 = (ix - ix2 - 0.5) ** 2 + 3.0 * (iy - iy2 - 0.5) ** 2
+        return np.where(d1 < d2, i1, i2)
+
+    def counts(self, x, y, weights=None) -> np.ndarray:
+        """ Number of points (or sum of `weights`) in each hexagon.
+        """
+        return np.bincount(self.index(x, y), weights=weights, minlength=self.n + 1)[:self.n]
+
+    def attempts_and_makes(self, x, y, made):
+        """ Shots and made shots per hexagon, from a single binning pass.
+        """
+        index = self.index(x, y)
+        attempts = np.bincount(index, minlength=self.n + 1)[:self.n]
+        makes = np.bincount(index, weights=np.asarray(made, float), minlength=self.n + 1)[:self.n]
+        return attempts, makes
+
+    def draw(self, ax, values, mincnt=None, cmap=None, norm=None) -> mcoll.PolyCollection:
+        """ Draw `values` (one per hexagon) on `ax` like `ax.hexbin` would, reusing the geometry.
+        """
+        values = np.asarray(values, float)
+        keep = np.ones(self.n, bool) if mincnt is None else values >= mincnt
+        collection = mcoll.PolyCollection(
+            [self.polygon],
+            edgecolors='face',
+            linewidths=[mpl.rcParams['patch.linewidth']],
+            offsets=self.centers[keep],
+            offset_transform=mtransforms.AffineDeltaTransform(ax.transData)
+        )
+        collection.set_array(values[keep])
+        collection.set_cmap(cmap)
+        collection.set_norm(norm)
+        if keep.any():
+            collection.autoscale_None()
+        ax.add_collection(collection, autolim=False)
+        return collection
+
+
+@lru_cache(maxsize=16)
+def hex_grid(extent=COURT_EXTENT, gridsize=25) -> HexGrid:
+    """ Shared HexGrid for an (extent, gridsize) pair.
+    """
+    return HexGrid(tuple(extent), gridsize)
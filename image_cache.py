@@ -0,0 +1,186 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from io import BytesIO
+from typing import Optional
+
+import requests
+from PIL import Image, UnidentifiedImageError
+from requests.exceptions import RequestException
+
+from snapshot_store import SNAPSHOT_DIR
+
+
+IMAGE_CACHE_DIR = os.environ.get('NBA_IMAGE_CACHE_DIR', os.path.join(SNAPSHOT_DIR, 'images'))
+
+
+class ImageCache:
+    """ Local cache for remote images (headshots, team logos, player photos).
+
+    Downloads are stored on disk by content hash, with a small metadata file per URL
+    holding the ETag / Last-Modified used to revalidate it once `ttl` has passed.
+    404s are remembered for `negative_ttl`. In memory, an LRU keeps the encoded bytes
+    and decoded PIL images of recently used URLs. Both count against
+    `max_memory_bytes`, a decoded image as width * height * bands. Repeat renders
+    therefore do no network I/O, and a failed revalidation falls back to the stored copy.
+    """
+
+    def __init__(self, root: str = IMAGE_CACHE_DIR, ttl: float = 24 * 60 * 60,
+                 negative_ttl: float = 60 * 60, max_memory_bytes: int = 32 * 2**20,
+                 timeout: float = 10):
+        self.root = root
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_memory_bytes = max_memory_bytes
+        self.timeout = timeout
+        self._bytes = OrderedDict()
+        self._images = OrderedDict()
+        self._memory_bytes = 0
+        self._checked_at = {}
+        self._lock = threading.Lock()
+
+    def get_bytes(self, url: str) -> Optional[bytes]:
+        """ Encoded image for `url`, or None if it does not exist or cannot be fetched.
+        """
+        with self._lock:
+            data = self._bytes.get(url)
+            if data is not None and time.time() - self._checked_at.get(url, 0) < self.ttl:
+                self._bytes.move_to_end(url)
+                return data
+
+        meta = self._read_meta(url)
+        now = time.time()
+        if meta.get('status') == 404 and now - meta.get('checked_at', 0) < self.negative_ttl:
+            return None
+        data = self._read_blob(meta.get('sha256'))
+        if data is not None and now - meta.get('checked_at', 0) < self.ttl:
+            self._remember(url, data, meta['checked_at'])
+            return data
+
+        data = self._revalidate(url, meta, data)
+        if data is not None:
+            self._remember(url, data, time.time())
+        return data
+
+    def get_image(self, url: str) -> Optional[Image.Image]:
+        """ Decoded PIL image for `url`; shared between callers, so do not modify it.
+        """
+        data = self.get_bytes(url)
+        if data is None:
+            return None
+        with self._lock:
+            cached = self._images.get(url)
+            if cached is not None and cached[0] is data:
+                self._bytes.move_to_end(url)
+                return cached[1]
+        try:
+            image = Image.open(BytesIO(data))
+            image.load()
+        except (UnidentifiedImageError, OSError):
+            return None
+        with self._lock:
+            # Only kept while its bytes are; evicted together with them
+            if self._bytes.get(url) is data:
+                self._drop_image(url)
+                size = image.width * image.height * len(image.getbands())
+                self._images[url] = (data, image, size)
+                self._memory_bytes += size
+                self._evict()
+        return image
+
+    def _revalidate(self, url, meta, stored):
+        headers = {}
+        if stored is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        try:
+            response = requests.get(url, headers=headers, timeout=self.timeout)
+        except RequestException:
+            return stored
+
+        if response.status_code == 304 and stored is not None:
+            self._write_meta(url, dict(meta, checked_at=time.time()))
+            return stored
+        if response.status_code in (404, 410):
+            self._write_meta(url, {'status': 404, 'checked_at': time.time()})
+            return None
+        if response.status_code != 200 or not response.headers.get('Content-Type', 'image/').startswith('image/'):
+            return stored
+
+        data = response.content
+        sha256 = hashlib.sha256(data).hexdigest()
+        self._write_file(self._blob_path(sha256), data)
+        self._write_meta(url, {'status': 200, 'sha256': sha256, 'checked_at': time.time(),
+                               'etag': response.headers.get('ETag'),
+                               'last_modified': response.headers.get('Last-Modified')})
+        return data
+
+    def _remember(self, url, data, checked_at):
+        with self._lock:
+            previous = self._bytes.pop(url, None)
+            if previous is not None:
+                self._memory_bytes -= len(previous)
+                if previous is not data:
+                    self._drop_image(url)
+            self._bytes[url] = data
+            self._checked_at[url] = checked_at
+            self._memory_bytes += len(data)
+            self._evict()
+
+    def _evict(self):
+        # Least recently used URLs go first, with their decoded image; the newest always stays
+        while self._memory_bytes > self.max_memory_bytes and len(self._bytes) > 1:
+            evicted_url, evicted = self._bytes.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self._drop_image(evicted_url)
+            self._checked_at.pop(evicted_url, None)
+
+    def _drop_image(self, url):
+        cached = self._images.pop(url, None)
+        if cached is not None:
+            self._memory_bytes -= cached[2]
+
+    def _meta_path(self, url):
+        return os.path.join(self.root, 'urls', hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+
+    def _blob_path(self, sha256):
+        return os.path.join(self.root, 'blobs', sha256[:2], sha256)
+
+    def _read_meta(self, url):
+        try:
+            with open(self._meta_path(url)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _read_blob(self, sha256):
+        if not sha256:
+            return None
+        try:
+            with open(self._blob_path(sha256), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_meta(self, url, meta):
+        self._write_file(self._meta_path(url), json.dumps(meta).encode('utf-8'))
+
+    @staticmethod
+    def _write_file(path, data):
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+
+image_cache = ImageCache()
@@ -0,0 +1,131 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from dataset_cache import derived_cache
+
+
+# Display categories of the Top Performers chart and the stat column behind each
+CATEGORIES = {
+    'Points': 'PTS',
+    'Assists': 'AST',
+    'Rebounds': 'TRB',
+    'Steals': 'STL',
+    'Blocks': 'BLK',
+    'FG Percentage': 'FG%',
+    '3P Percentage': '3P%',
+    'FT Percentage': 'FT%',
+}
+# Minimum attempts (strictly more than, per game) a player needs to rank in a percentage stat
+QUALIFIERS = {'FG%': ('FGA', 5), '3P%': ('3PA', 2), 'FT%': ('FTA', 2)}
+SLICES = ('Pos', 'Tm')
+TOP_K = 25
+
+
+def top_k(values: np.ndarray, rows: np.ndarray, k: int) -> np.ndarray:
+    """ The `rows` with the `k` largest `values[rows]`, best first, NaNs skipped.
+
+    `argpartition` finds the k-th largest value in linear time, so only the k winners
+    are ordered. Ties keep row order, including ties at the cut-off.
+    """
+    rows = rows[~np.isnan(values[rows])]
+    if len(rows) > k > 0:
+        keys = -values[rows]
+        threshold = keys[np.argpartition(keys, k - 1)[k - 1]]
+        above = rows[keys < threshold]
+        rows = np.concatenate([above, rows[keys == threshold][:k - len(above)]])
+    elif k <= 0:
+        rows = rows[:0]
+    # Stable ordering of at most k rows
+    return rows[np.argsort(-values[rows], kind='stable')]
+
+
+class LeaderboardIndex:
+    """ Precomputed top-k rows of every numeric stat, league-wide and per position and team.
+
+    Built once per dataset version: each list is an `argpartition` over the rows of
+    its slice, so serving a leaderboard is a row lookup with no sorting. Percentage
+    stats only rank players above the minimum attempts in `qualifiers` (the notebook's
+    `FGA > 5`, `3PA > 2`, `FTA > 2`). Requests for more than `k` rows, or for a
+    position and a team at once, are answered on demand from the slice's rows.
+    """
+
+    def __init__(self, df: pd.DataFrame, k: int = TOP_K, slices: Sequence[str] = SLICES,
+                 qualifiers: Dict[str, Tuple[str, float]] = QUALIFIERS):
+        self.frame = df.reset_index(drop=True)
+        self.k = k
+        self.qualifiers = dict(qualifiers)
+        numeric = self.frame.select_dtypes(include=[np.number])
+        self.stats = list(numeric.columns)
+        self._values = {stat: numeric[stat].to_numpy(float) for stat in self.stats}
+        self._eligible = {stat: self._eligible_rows(stat) for stat in self.stats}
+        self._groups = {column: dict(self.frame.groupby(column, observed=True).indices)
+                        for column in slices if column in self.frame.columns}
+        self._tops = {}
+        for stat in self.stats:
+            eligible = self._eligible[stat]
+            self._tops[stat, None, None] = top_k(self._values[stat], eligible, k)
+            for column, groups in self._groups.items():
+                for value, rows in groups.items():
+                    self._tops[stat, column, value] = top_k(self._values[stat], np.intersect1d(rows, eligible), k)
+
+    def _eligible_rows(self, stat):
+        rows = np.arange(len(self.frame))
+        qualifier = self.qualifiers.get(stat)
+        if qualifier is None or qualifier[0] not in self._values:
+            return rows
+        attempts, minimum = qualifier
+        return rows[self._values[attempts] > minimum]
+
+    def rows(self, stat: str, n: int = 10, position: Optional[str] = None,
+             team: Optional[str] = None) -> np.ndarray:
+        """ Row positions of the `n` leaders in `stat`, best first.
+        """
+        slices = [(column, value) for column, value in (('Pos', position), ('Tm', team)) if value is not None]
+        return self._rows(stat, n, slices)
+
+    def _rows(self, stat, n, slices):
+        if stat not in self._values:
+            raise KeyError(f"Unknown stat column: {stat}")
+        if len(slices) <= 1 and n <= self.k:
+            column, value = slices[0] if slices else (None, None)
+            return self._tops.get((stat, column, value), np.empty(0, int))[:n]
+
+        rows = self._eligible[stat]
+        for column, value in slices:
+            rows = np.intersect1d(rows, self._groups.get(column, {}).get(value, np.empty(0, int)))
+        return top_k(self._values[stat], rows, n)
+
+    def groups(self, column: str = 'Pos') -> List:
+        """ Values of a slice column that have rows, e.g. every listed position.
+        """
+        return list(self._groups.get(column, {}))
+
+    def top_per_group(self, stat: str, n: int = TOP_K, column: str = 'Pos', groups: Optional[Sequence] = None,
+                      columns: Sequence[str] = ('Player',)) -> pd.DataFrame:
+        """ The `n` leaders in `stat` of each `column` group (all groups, or `groups`), as a small frame.
+
+        The per-group lists are concatenated as stored, so the rows come out group by
+        group, best first within each; the source frame is not touched.
+        """
+        groups = self.groups(column) if groups is None else groups
+        rows = [self._rows(stat, n, [(column, group)]) for group in groups]
+        rows = np.concatenate(rows) if rows else np.empty(0, int)
+        columns = [c for c in columns if c not in (column, stat)] + [column, stat]
+        return self.frame.iloc[rows][columns].reset_index(drop=True)
+
+    def top(self, stat: str, n: int = 10, position: Optional[str] = None, team: Optional[str] = None,
+            columns: Sequence[str] = ('Player',)) -> pd.DataFrame:
+        """ The `n` leaders in `stat` as a `columns + [stat]` frame, best first.
+        """
+        columns = [column for column in columns if column != stat] + [stat]
+        return self.frame.iloc[self.rows(stat, n, position, team)][columns].reset_index(drop=True)
+
+
+def leaderboard_index(df: pd.DataFrame, version: Optional[str] = None) -> LeaderboardIndex:
+    """ The LeaderboardIndex of `df`, shared per dataset `version` (built uncached without one).
+    """
+    if version is None:
+        return LeaderboardIndex(df)
+    return derived_cache.get('leaderboard_index', version, lambda: LeaderboardIndex(df))
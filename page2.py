@@ -1,6 +1,5 @@
 import streamlit as st
 import requests
-import difflib
 from PIL import Image
 from io import BytesIO
 import pandas as pd
@@ -8,11 +7,15 @@ import plotly.express as px
 import plotly.graph_objs as go
 from plotly.subplots import make_subplots
 import json
+from dataset_cache import get_dataset
+from player_registry import get_player_registry
+from image_cache import image_cache
+from player_percentiles import RADAR_STATS, percentile_table
+from preprocessing import preprocess_data
 
-# Function to find the closest match using difflib
-def find_closest_match(user_input, candidate_list):
-    matches = difflib.get_close_matches(user_input, candidate_list)
-    return matches[0] if matches else None
+# Function to find the closest match using the prebuilt player name index
+def find_closest_match(user_input, name_index):
+    return name_index.best_match(user_input)
 
 
 # Function to get team logo URL from GitHub
@@ -24,54 +27,24 @@ def get_team_logo_url(team_abbreviation):
 
 # Function to fetch data from the API
 def fetch_data(api_url):
-    response = requests.get(api_url)
-    
-    if response.status_code == 200:
-        data = response.json()
-        data = pd.read_json(data)
-        df = pd.DataFrame(data) 
-        return df
-    else:
-        df = pd.read_csv("./Sample_Data/NBA_2024_per_game.csv")
-        #st.error(f"Error fetching data from the API. Status code: {response.status_code}")
-        return df
-
-# Function to preprocess data
-def preprocess_data(df):
-    # Convert 'MP' column to numeric, handling errors by coercing to NaN
-    df['MP'] = pd.to_numeric(df['MP'], errors='coerce')
-
-    # Filter rows where 'MP' is greater than 5
-    df = df.loc[df['MP'] > 5]
-
-    # Identify players who have been traded
-    players = df.Player.value_counts()
-    traded_players = players[players > 1].keys()
-
-    # Filter out rows where a player is traded but not marked as 'TOT'
-    df = df.loc[(~df.Player.isin(traded_players)) | (df.Player.isin(traded_players) & (df.Tm == 'TOT'))]
-
-    return df
+    # Served from the process-wide cache; falls back to the sample CSV when the API is down.
+    # The returned frame is shared across sessions, so treat it as read-only.
+    return get_dataset(api_url).df
 
 
-def generate_player_comparison_plots(df, player1, player2):
+def generate_player_comparison_plots(df, player1, player2, version=None):
 
     import plotly.express as px
     import plotly.graph_objects as go
     from plotly.subplots import make_subplots
-    # Process the stats DataFrame
-    stats = df[['Player', 'PTS', 'AST', 'TRB', 'STL', 'BLK']].copy()
-    stats['PTS'] = pd.qcut(stats['PTS'], q=5, labels=False) + 1
-    stats['AST'] = pd.qcut(stats['AST'], q=5, labels=False) + 1
-    stats['TRB'] = pd.qcut(stats['TRB'], q=5, labels=False) + 1
-    stats['STL'] = pd.qcut(stats['STL'], q=5, labels=False) + 1
-    stats['BLK'] = pd.qcut(stats['BLK'], q=5, labels=False, duplicates='drop') + 1
-    stats.loc[stats.BLK > 1, 'BLK'] = stats.loc[stats.BLK > 1, 'BLK'] + 1
-    stats = pd.melt(stats, id_vars=['Player'], value_vars=['PTS', 'AST', 'TRB', 'STL', 'BLK'])
+    # League quintiles of every stat are computed once per dataset version; comparing
+    # players is a row lookup
+    table = percentile_table(df, version)
 
     # Select players
     players = [player1, player2]
-    stats_filtered = stats.loc[stats['Player'].isin(players)]
+    stats_filtered = table.radar(players, RADAR_STATS)
+    quintiles = table.lookup(players, RADAR_STATS)
 
     # Generate a title with player names
     title = f"Player Stats"
@@ -83,8 +56,8 @@ def generate_player_comparison_plots(df, player1, player2):
     # Add player 1's data to the first subplot
     fig.add_trace(
         go.Scatterpolar(
-            r=stats_filtered[stats_filtered['Player'] == player1]['value'],
-            theta=stats_filtered[stats_filtered['Player'] == player1]['variable'],
+            r=quintiles.iloc[0],
+            theta=quintiles.columns,
             fill='toself',
             name=player1
         ), 
@@ -94,8 +67,8 @@ def generate_player_comparison_plots(df, player1, player2):
     # Add player 2's data to the second subplot
     fig.add_trace(
         go.Scatterpolar(
-            r=stats_filtered[stats_filtered['Player'] == player2]['value'],
-            theta=stats_filtered[stats_filtered['Player'] == player2]['variable'],
+            r=quintiles.iloc[1],
+            theta=quintiles.columns,
             fill='toself',
             name=player2
         ), 
@@ -117,11 +90,11 @@ def generate_player_comparison_plots(df, player1, player2):
     #st.plotly_chart(fig1)
 
     # Plot 2: Two Line Polars
-    #fig2_1 = px.line_polar(stats_filtered[stats_filtered['Player'] == player1],
+    #fig2_1 = px.line_polar(table.radar([player1]),
                            #r='value', theta='variable', line_close=True, color='Player',
                            #title=f"{player1}'s Stats")
 
-    #fig2_2 = px.line_polar(stats_filtered[stats_filtered['Player'] == player2],
+    #fig2_2 = px.line_polar(table.radar([player2]),
                            #r='value', theta='variable', line_close=True, color='Player',
                            #title=f"{player2}'s Stats")
 
@@ -137,15 +110,15 @@ def generate_player_comparison_plots(df, player1, player2):
     #fig3 = make_subplots(rows=1, cols=2, subplot_titles=[f"{player1}'s Stats", f"{player2}'s Stats"])
 
     #fig3.add_trace(go.Scatterpolar(
-        #r=stats_filtered[stats_filtered['Player'] == player1]['value'],
-        #theta=stats_filtered[stats_filtered['Player'] == player1]['variable'],
+        #r=quintiles.iloc[0],
+        #theta=quintiles.columns,
         #fill='toself',
         #name=player1
     #))
 
     #fig3.add_trace(go.Scatterpolar(
-        #r=stats_filtered[stats_filtered['Player'] == player2]['value'],
-        #theta=stats_filtered[stats_filtered['Player'] == player2]['variable'],
+        #r=quintiles.iloc[1],
+        #theta=quintiles.columns,
         #fill='toself',
         #name=player2
     #))
@@ -198,8 +171,10 @@ def page_2():
     
     # Fetch and preprocess NBA data
     api_url = 'https://nba-api-ash-1-fc1674476d71.herokuapp.com/dataset'
-    nba_data = fetch_data(api_url)
-    preprocessed_data = preprocess_data(nba_data)
+    dataset = get_dataset(api_url)
+    nba_data = dataset.df
+    preprocessed_data = preprocess_data(nba_data, dataset.version)
+    registry = get_player_registry(dataset)
     
     # Function to display player information and generate comparison plots
     def display_player_info_and_compare(player_name, preprocessed_data, other_player_name=None):
@@ -208,22 +183,19 @@ def page_2():
     
         # If the other player's name is also provided, generate comparison plots
         if other_player_name:
-            generate_player_comparison_plots(preprocessed_data, player_name, other_player_name)
+            generate_player_comparison_plots(preprocessed_data, player_name, other_player_name, dataset.version)
     
     # Function to display player information (same as before)
     def display_player_info(player_name):
-        # API Call to fetch player data
-        response = requests.get(f"https://nba-api-ash-1-fc1674476d71.herokuapp.com/players/{player_name}")
-        response_image = requests.get(f"https://nba-api-ash-1-fc1674476d71.herokuapp.com/get_images/{player_name}")
+        # Stats and bio come from the player registry (hash lookups, no API round-trip)
+        data = registry.resolve(player_name)
     
-        if response.status_code == 200:
-            data = response.json()
+        if data is not None:
             st.write(f"Player Name: {data.get('API_Names', 'N/A')}")
     
             # Display player image
-            if response_image.status_code == 200:
-                image_url = response_image.json()["image"]
-                img = Image.open(BytesIO(requests.get(image_url).content))
+            img = image_cache.get_image(data['image'])
+            if img is not None:
                 st.image(img)
             else:
                 st.error("Failed to load player image.")
@@ -234,8 +206,9 @@ def page_2():
             full_team_name = team_name_mapping.get(team_abbreviation, "N/A")
             #st.text(f"Currently Plays for: {full_team_name}")
             if team_abbreviation:
-                team_logo_url = get_team_logo_url(team_abbreviation)
-                st.image(team_logo_url, width=100)
+                team_logo = image_cache.get_bytes(get_team_logo_url(team_abbreviation))
+                if team_logo is not None:
+                    st.image(team_logo, width=100)
                 
     
             st.text(f"Birthday: {data.get('birthday', 'N/A')}")
@@ -269,9 +242,8 @@ def page_2():
     
     #api_player_names = requests.get("https://nba-api-ash-1-fc1674476d71.herokuapp.com/players").json()
 
-    nba_data = pd.read_csv("./Sample_Data/NBA_2024_per_game.csv")
-    players = nba_data['Player'].unique().tolist()
-    api_player_names = players
+    # Built once per dataset version and shared by every session
+    api_player_names = registry.name_index
     
     # Display based on the selected feature
     if feature == "Player Search and Stats":
@@ -280,7 +252,7 @@ def page_2():
         if player_input:
             player_name = find_closest_match(player_input, api_player_names)
             if player_name:
-                display_player_info(player_name.replace(" ", "%20"))
+                display_player_info(player_name)
             else:
                 st.warning("Player not found. Please try again.")
     elif feature == "Player Comparison":
@@ -299,14 +271,14 @@ def page_2():
                 col1, col2 = st.columns(2)
                 with col1:
                     st.subheader(player1)
-                    display_player_info(player1.replace(" ", "%20"))
+                    display_player_info(player1)
     
                 with col2:
                     st.subheader(player2)
-                    display_player_info(player2.replace(" ", "%20"))
+                    display_player_info(player2)
     
                 #st.header("Player Comparison")
-                generate_player_comparison_plots(preprocessed_data, player1, player2)
+                generate_player_comparison_plots(preprocessed_data, player1, player2, dataset.version)
             else:
                 st.warning("One or both players not found. Please try again.")
         
@@ -1,6 +1,6 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 import requests
-import difflib
 import matplotlib.pyplot as plt
 import plotly.graph_objects as go
 from io import BytesIO
@@ -13,6 +13,11 @@ from PIL import Image
 import matplotlib.pyplot as plt
 from botocore.exceptions import NoCredentialsError
 import pandas as pd
+from player_registry import get_player_registry
+from image_cache import image_cache
+from s3_reader import LocalS3Client, list_objects, object_cache, s3_client
+from reddit_feed import REDDIT_BUCKET, load_reddit_feed, local_feed_client
+from prediction import predict_many
 
 # Function to calculate countdown or game status
 def get_game_status(game_time_utc, game_end_time_et):
@@ -34,14 +39,37 @@ def get_game_status(game_time_utc, game_end_time_et):
         return "Game has ended", "green"
         
 
-def display_predicted_winner(home_team, away_team):
+def fetch_remote_prediction(tri_home, tri_away):
+    # The hosted model; None if it cannot be reached or answers with something unexpected
+    request_pred = f"https://nba-api-ash-1-fc1674476d71.herokuapp.com/predict?team1={tri_home}&team2={tri_away}"
+    try:
+        return requests.get(request_pred, timeout=5).json()['Predicted Winner']
+    except (requests.RequestException, ValueError, KeyError):
+        return None
+
+
+def predict_slate(matchups):
+    # Scored in-process for the whole slate; games the local model cannot score (no
+    # artifact, or an unknown team) are sent to the remote model all at once
+    winners = predict_many(matchups)
+    missing = [i for i, winner in enumerate(winners) if winner is None]
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(8, len(missing))) as pool:
+            for i, winner in zip(missing, pool.map(lambda i: fetch_remote_prediction(*matchups[i]), missing)):
+                winners[i] = winner
+    return winners
+
+
+def display_predicted_winner(home_team, away_team, predicted_winner=None, ask_remote=True):
     tri_home = home_team["teamTricode"]
     tri_away = away_team["teamTricode"]
 
-    request_pred = f"https://nba-api-ash-1-fc1674476d71.herokuapp.com/predict?team1={tri_home}&team2={tri_away}"
-    try:
-        request_pred_1 = requests.get(request_pred).json()['Predicted Winner']
-    except:
+    # live_page scores the whole slate up front (see predict_slate), so the remote model is
+    # only asked here when a caller passes no prediction
+    request_pred_1 = predicted_winner
+    if request_pred_1 is None and ask_remote:
+        request_pred_1 = fetch_remote_prediction(tri_home, tri_away)
+    if request_pred_1 is None:
         # Fallback to a simple comparison if the request fails
         if home_team['wins'] > away_team['wins']:
             request_pred_1 = tri_home
@@ -87,62 +115,11 @@ def draw_radial_chart(leader_data, title):
     return fig
 
 def get_player_image(Name):
-# List of all players from the API
-    
-    #api_player_names = requests.get("https://nba-api-ash-1-fc1674476d71.herokuapp.com/players").json()
+    # Resolve the leader's name to an image URL through the shared player registry:
+    # an alias hash lookup, with the fuzzy name index only used on a miss
+    return get_player_registry().image_url(Name)
 
-    nba_data = pd.read_csv("./Sample_Data/NBA_2024_per_game.csv")
-    players = nba_data['Player'].unique().tolist()
-    api_player_names = json.dumps(players)
-    
-    
-    # Get player name from the user
-    user_input = Name
-    
-    # Function to find the closest match using difflib
-    def find_closest_match(user_input, candidate_list):
-        matches = difflib.get_close_matches(user_input, candidate_list)
-        if matches:
-            return matches[0]
-        else:
-            return None
-    
-    # Find the closest match in the API player names
-    closest_match = find_closest_match(user_input, api_player_names)
-    # Replace spaces with "%20" for URL encoding
-    player_name_encoded = closest_match.replace(" ", "%20") if closest_match else None
 
-    try:
-    # API endpoint
-        #api_url_2 = f"https://nba-api-ash-1-fc1674476d71.herokuapp.com/get_images/{player_name_encoded}"
-        #response_2 = requests.get(api_url_2)
-        #image_url = response_2.json()["image"]
-
-        images_data = pd.read_csv("./Sample_Data/images_data.csv")
-        player_data = images_data[images_data['API_Names'] == player_name_encoded].playerid.values[0]
-        xxx = "https://raw.githubusercontent.com/AshKans1412/NBA-Analysis-API/main/Assests/img/" + str(player_data) + ".png"
-        image_url = xxx
-    
-    except:
-        xxx = "https://raw.githubusercontent.com/AshKans1412/NBA-Analysis-API/main/Assests/img/default.png"
-        image_url = xxx
-    return image_url
-
-
-def plot_image_from_url(image_url):
-    
-    response = requests.get(image_url)
-    #response.raise_for_status()  # Raise an error for bad status codes
-
-    image = Image.open(BytesIO(response.content))
-
-    # Plotting the image using Matplotlib
-    fig, ax = plt.subplots(figsize=(3, 2))    
-    ax.imshow(image)
-    ax.axis('off')  # Hide the axis
-    return fig
-
-    
 def get_period_scores(team_data):
     return [period['score'] for period in team_data['periods']]
 
@@ -168,35 +145,30 @@ def draw_pie_chart(wins, losses, team_name):
 
 
 def read_files_from_s3(bucket_name, folder_path, aws_access_key_id, aws_secret_access_key):
-    # Initialize Boto3 S3 client
-    s3 = boto3.client(
-        's3',
-        aws_access_key_id=aws_access_key_id,
-        aws_secret_access_key=aws_secret_access_key
-    )
+    # Shared Boto3 S3 client, pooled for concurrent gets
+    s3 = s3_client(aws_access_key_id, aws_secret_access_key)
     
-    # List files in the specified S3 bucket directory
-    response = s3.list_objects_v2(Bucket=bucket_name, Prefix=folder_path)
-    files = [item['Key'] for item in response.get('Contents', []) if item['Key'].endswith('.json')]
+    # List files in the specified S3 bucket directory (every page, not just the first 1,000 keys),
+    # with the ETags used to skip downloading unchanged files
+    files = list_objects(s3, bucket_name, folder_path, '.json')
     return s3, files
 
 
 def read_files_from_s3_aws_env(bucket_name, folder_path):
-    # Initialize Boto3 S3 client
-    s3 = boto3.client(
-        's3'
-    )
+    # Shared Boto3 S3 client, with credentials from the environment
+    s3 = s3_client()
     
     # List files in the specified S3 bucket directory
-    response = s3.list_objects_v2(Bucket=bucket_name, Prefix=folder_path)
-    files = [item['Key'] for item in response.get('Contents', []) if item['Key'].endswith('.json')]
+    files = list_objects(s3, bucket_name, folder_path, '.json')
     return s3, files
 
 
 def read_files_from_local(local_folder_path):
-    # List files in the specified local directory
-    files = [f for f in os.listdir(local_folder_path) if f.endswith('.json')]
-    return None, files
+    # The local folder is served as a bucket by a filesystem-backed S3 stand-in; only its
+    # top-level files are games (subfolders such as the Reddit feed are listed separately)
+    s3 = LocalS3Client(os.path.dirname(local_folder_path) or '.')
+    files = list_objects(s3, os.path.basename(local_folder_path), '', '.json', delimiter='/')
+    return s3, files
 
 def live_page(source='local'):
     if source == 'streamlit':
@@ -208,6 +180,7 @@ def live_page(source='local'):
         
     elif source == 'local':
         local_folder_path = 'Sample_Data'
+        bucket_name = os.path.basename(local_folder_path)
         s3, files = read_files_from_local(local_folder_path)
         
     elif source == 'aws':
@@ -223,14 +196,25 @@ def live_page(source='local'):
     if st.button('Refresh'):
         st.experimental_rerun()
 
-    for file_key in files:
-        # Read file content
-        if (source == 'aws') or (source == 'streamlit') :
-            obj = s3.get_object(Bucket=bucket_name, Key=file_key)
-            match_data = json.loads(obj['Body'].read().decode('utf-8'))
-        else:
-            with open(os.path.join(local_folder_path, file_key), 'r') as file:
-                match_data = json.load(file)
+    # Only games whose ETag changed since the last refresh (in any session) are downloaded;
+    # they are fetched concurrently and arrive in listing order
+    games = list(object_cache.read(s3, bucket_name, files))
+    # Every game on the slate is scored before rendering: by the local model in one call,
+    # with any remote fallbacks sent concurrently
+    predicted_winners = predict_slate([(match_data['homeTeam']['teamTricode'], match_data['awayTeam']['teamTricode'])
+                                       for _, match_data in games])
+    # Logos and leader photos are static images: fetch every one on the slate concurrently
+    # (repeat visits are served by the shared image cache) and show the bytes as they are
+    logo_url = "https://raw.githubusercontent.com/Kaushiknb11/Basketball_Analytics/main/Teams/{}.png"
+    image_urls = {}
+    for _, match_data in games:
+        for side, leaders in (('homeTeam', 'homeLeaders'), ('awayTeam', 'awayLeaders')):
+            image_urls[logo_url.format(match_data[side]["teamTricode"])] = None
+            image_urls[get_player_image(match_data["gameLeaders"][leaders]["name"])] = None
+    if image_urls:
+        with ThreadPoolExecutor(max_workers=min(8, len(image_urls))) as pool:
+            image_urls = dict(zip(image_urls, pool.map(image_cache.get_bytes, image_urls)))
+    for (file_key, match_data), predicted_winner in zip(games, predicted_winners):
         
         game_status, color = get_game_status(match_data['gameTimeUTC'], match_data['gameEt'])
         home_team = match_data['homeTeam']
@@ -238,6 +222,10 @@ def live_page(source='local'):
 
         # Modify expander title to include game status
         expander_title = f"{home_team['teamName']} vs {away_team['teamName']}"
+        home_logo = image_urls[logo_url.format(home_team["teamTricode"])]
+        home_leader_image = image_urls[get_player_image(match_data["gameLeaders"]["homeLeaders"]["name"])]
+        away_logo = image_urls[logo_url.format(away_team["teamTricode"])]
+        away_leader_image = image_urls[get_player_image(match_data["gameLeaders"]["awayLeaders"]["name"])]
         with st.expander(expander_title, expanded=False):    
             
             
@@ -262,17 +250,17 @@ def live_page(source='local'):
                 with col1_1:
 
                     
-                    image_fig = plot_image_from_url(github_url)
-                    st.pyplot(image_fig) 
+                    if home_logo is not None:
+
+                    
+                        st.image(home_logo)
                     st.plotly_chart(draw_pie_chart(home_team_wins, home_team_losses, home_team['teamName']))
                     Home_Leader = match_data["gameLeaders"]["homeLeaders"]["name"]
                     #st.write(Home_Leader)
                     
-                    image_url = get_player_image(Home_Leader)
-                    image_fig = plot_image_from_url(image_url)
-
                     # Display the plot in Streamlit
-                    st.pyplot(image_fig)
+                    if home_leader_image is not None:
+                        st.image(home_leader_image)
 
 
                 with col1_2:
@@ -318,17 +306,16 @@ def live_page(source='local'):
                 
                 with col2_1:
                     
-                    image_fig = plot_image_from_url(github_url)
-                    st.pyplot(image_fig) 
+                    if away_logo is not None:
+                    
+                        st.image(away_logo)
                     st.plotly_chart(draw_pie_chart(away_team_wins, away_team_losses, away_team['teamName']))
                     Away_Leader = match_data["gameLeaders"]["awayLeaders"]["name"]
                     #st.write(Away_Leader)
                     
-                    image_url = get_player_image(Away_Leader)
-                    image_fig = plot_image_from_url(image_url)
-
                     # Display the plot in Streamlit
-                    st.pyplot(image_fig)
+                    if away_leader_image is not None:
+                        st.image(away_leader_image)
 
                 with col2_2:
                     st.header("Away Team")
@@ -367,37 +354,32 @@ def live_page(source='local'):
             tri_away = away_team["teamTricode"]
             home_team = {"teamTricode": tri_home, "wins": home_team_wins}
             away_team = {"teamTricode": tri_away, "wins": away_team_wins}
-            display_predicted_winner(home_team, away_team)
+            display_predicted_winner(home_team, away_team, predicted_winner, ask_remote=False)
 
 
     st.markdown("---")
-    bucket_name = 'ash-dcsc-project'
-    folder_name = 'NBA_Live_Data/Reddit_Posts_Summarized/'
+    # Local mode reads the feed from a directory laid out like the bucket
+    if source == 'local':
+        s3, bucket_name = local_feed_client()
+    else:
+        bucket_name = REDDIT_BUCKET
 
     
     st.title("Top Discussion on NBA for this week")
     
     try:
-        response = s3.list_objects_v2(Bucket=bucket_name, Prefix=folder_name)
-        if 'Contents' in response:
-            for item in response['Contents']:
-                file_name = item['Key']
-                if file_name != folder_name:  # To skip the folder itself if it's listed
-                    # Read the content of the file
-                    obj = s3.get_object(Bucket=bucket_name, Key=file_name)
-                    file_content = json.loads(obj['Body'].read().decode('utf-8'))
-                    
-                    file_name_2 = file_name.replace("Reddit_Posts_Summarized", "Reddit_Posts")
-                    obj_2 = s3.get_object(Bucket=bucket_name, Key=file_name_2)
-                    file_content_2 = json.loads(obj_2['Body'].read().decode('utf-8'))
-    
-                    # Print the file name and its contents in Streamlit
-                    st.header(f"Post: {file_content_2['Title']}")
-                    st.text_area("Summary", file_content['summary'], height=50)
+        # One listing, then every summary and post fetched concurrently through the shared ETag cache
+        posts = load_reddit_feed(s3, bucket_name)
+        if not posts:
+            st.info("No discussions available for this week.")
+        for post in posts:
+            # Print the post title and its summary in Streamlit
+            st.header(f"Post: {post.title}")
+            st.text_area("Summary", post.summary, height=50)
     
-                    # Adding style to Upvotes and Author
-                    st.markdown(f"<b>Upvotes:</b> {file_content_2['Upvotes']}", unsafe_allow_html=True)
-                    st.markdown(f"<b>Author:</b> {file_content_2['Author']}", unsafe_allow_html=True)
+            # Adding style to Upvotes and Author
+            st.markdown(f"<b>Upvotes:</b> {post.upvotes}", unsafe_allow_html=True)
+            st.markdown(f"<b>Author:</b> {post.author}", unsafe_allow_html=True)
     except NoCredentialsError:
         st.error("Credentials not available. Please check your AWS configuration.")
     except Exception as e:
@@ -0,0 +1,60 @@
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from dataset_cache import derived_cache
+
+
+RADAR_STATS = ['PTS', 'AST', 'TRB', 'STL', 'BLK']
+QUANTILES = 5
+
+
+class PercentileTable:
+    """ League percentile ranks and quintile bins of every numeric stat, indexed by player.
+
+    Built once from a (preprocessed) season frame with vectorized ranking, so comparing
+    any number of players is a row lookup. Percentile ranks are the share of players
+    at or below a value (0-100]. Quintiles follow `pd.qcut(q=5, labels=False) + 1`:
+    bin i holds values in (q[i-1], q[i]] of the league's quantiles. When quantiles
+    tie (e.g. BLK, where many players sit at 0), a value keeps the bin of the
+    lowest tied quantile it does not exceed, so the bins stay numbered 1-5.
+    """
+
+    def __init__(self, df: pd.DataFrame, key: str = 'Player'):
+        frame = df.drop_duplicates(key).set_index(key)
+        numeric = frame.select_dtypes(include=[np.number])
+        self.stats = list(numeric.columns)
+        values = numeric.to_numpy(float)
+
+        self.percentiles = numeric.rank(method='max', pct=True) * 100
+        # All columns' quantile edges in one pass, then each column is binned with one searchsorted
+        edges = np.nanquantile(values, np.linspace(0, 1, QUANTILES + 1), axis=0)
+        bins = np.empty(values.shape)
+        for i in range(values.shape[1]):
+            bins[:, i] = np.searchsorted(edges[1:, i], values[:, i], side='left') + 1
+        bins[np.isnan(values)] = np.nan
+        self.quintiles = pd.DataFrame(bins, index=numeric.index, columns=self.stats)
+
+    def lookup(self, players: Sequence[str], stats: Sequence[str] = RADAR_STATS,
+               kind: str = 'quintile') -> pd.DataFrame:
+        """ Rows of `players` for `stats`, as quintiles or percentiles; unknown players get NaN rows.
+        """
+        table = self.quintiles if kind == 'quintile' else self.percentiles
+        return table.reindex(index=list(players), columns=list(stats))
+
+    def radar(self, players: Sequence[str], stats: Sequence[str] = RADAR_STATS,
+              kind: str = 'quintile') -> pd.DataFrame:
+        """ Long (Player, variable, value) frame for polar charts, in `players` order.
+        """
+        rows = self.lookup(players, stats, kind).dropna(how='all')
+        return (rows.rename_axis('Player').reset_index()
+                .melt(id_vars=['Player'], value_vars=list(stats)))
+
+
+def percentile_table(df: pd.DataFrame, version: Optional[str] = None) -> PercentileTable:
+    """ The PercentileTable of `df`, shared per dataset `version` (built uncached without one).
+    """
+    if version is None:
+        return PercentileTable(df)
+    return derived_cache.get('percentile_table', version, lambda: PercentileTable(df))
@@ -0,0 +1,97 @@
+from typing import Optional
+from urllib.parse import unquote
+
+import pandas as pd
+
+from dataset_cache import DatasetSnapshot, derived_cache
+from player_search import PlayerNameIndex, normalize_name
+from snapshot_store import snapshot_store, PER_GAME_CSV, IMAGES_CSV
+
+
+IMAGE_BASE_URL = "https://raw.githubusercontent.com/AshKans1412/NBA-Analysis-API/main/Assests/img/"
+DEFAULT_IMAGE_URL = IMAGE_BASE_URL + "default.png"
+
+
+class PlayerRegistry:
+    """ Hash indexes from player names, aliases and ids to one merged record per player.
+
+    A record is the player's season stats row (the `TOT` row for traded players, with
+    `Tm` set to their latest team) merged with their bio row from `images_data.csv`,
+    plus an `image` URL. Lookups by name or id are dict hits, and the fuzzy name index
+    is only used when a name is not a known alias.
+    """
+
+    def __init__(self, stats: pd.DataFrame, bios: pd.DataFrame):
+        self.records = []
+        self._by_key = {}
+        self._by_id = {}
+
+        # One row per player, preferring the TOT row of traded players
+        is_total = (stats['Tm'] == 'TOT').to_numpy()
+        rows = stats.iloc[is_total.argsort(kind='stable')[::-1]].drop_duplicates('Player').sort_index()
+        # Rows after TOT are in chronological order, so the last one is the current team
+        current_team = stats.drop_duplicates('Player', keep='last').set_index('Player')['Tm']
+        rows = rows.assign(Tm=rows['Player'].map(current_team), API_Names=rows['Player'])
+        for record in rows.to_dict('records'):
+            self._add(record, record['Player'])
+
+        with_bio = set()
+        for bio in bios.to_dict('records'):
+            record = self._by_key.get(normalize_name(bio['API_Names']))
+            if record is None:
+                record = {'Player': bio['API_Names'], 'API_Names': bio['API_Names']}
+                self._add(record, bio['API_Names'])
+            elif id(record) in with_bio:
+                # Some names appear more than once in images_data; the first row is the right one
+                continue
+            with_bio.add(id(record))
+            for column, value in bio.items():
+                record.setdefault(column, value)
+            record['image'] = f"{IMAGE_BASE_URL}{bio['playerid']}.png"
+            self._by_id[int(bio['playerid'])] = record
+
+        for record in self.records:
+            record.setdefault('image', DEFAULT_IMAGE_URL)
+        self.name_index = PlayerNameIndex(record['API_Names'] for record in self.records)
+
+    def _add(self, record, *aliases):
+        self.records.append(record)
+        for alias in aliases:
+            self._by_key.setdefault(normalize_name(alias), record)
+
+    def get(self, name: str) -> Optional[dict]:
+        """ Exact lookup by name or alias, ignoring case, accents, suffixes and URL encoding.
+        """
+        return self._by_key.get(normalize_name(unquote(str(name))))
+
+    def by_id(self, playerid: int) -> Optional[dict]:
+        return self._by_id.get(int(playerid))
+
+    def resolve(self, name: str) -> Optional[dict]:
+        """ Exact lookup, falling back to the closest name in the fuzzy index.
+        """
+        record = self.get(name)
+        if record is None:
+            match = self.name_index.best_match(unquote(str(name)))
+            record = self.get(match) if match else None
+        return record
+
+    def image_url(self, name: str) -> str:
+        record = self.resolve(name)
+        return record['image'] if record else DEFAULT_IMAGE_URL
+
+
+def get_player_registry(snapshot: Optional[DatasetSnapshot] = None) -> PlayerRegistry:
+    """ Registry for a dataset snapshot (or the per-game CSV), built once per version.
+    """
+    bios_version = snapshot_store.version(IMAGES_CSV)
+    if snapshot is None:
+        key = ('player_registry', PER_GAME_CSV)
+        version = f"{snapshot_store.version(PER_GAME_CSV)}/{bios_version}"
+        load_stats = lambda: snapshot_store.read_csv(PER_GAME_CSV)
+    else:
+        key = ('player_registry', 'dataset')
+        version = f"{snapshot.version}/{bios_version}"
+        load_stats = lambda: snapshot.df
+    return derived_cache.get(key, version,
+                             lambda: PlayerRegistry(load_stats(), snapshot_store.read_csv(IMAGES_CSV)))
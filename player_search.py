@@ -0,0 +1,124 @@
+import difflib
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv', 'v'}
+_PUNCTUATION = re.compile(r"[^a-z0-9 ]+")
+
+
+def normalize_name(name: str) -> str:
+    """ Lowercase ASCII form of a name, without accents, punctuation or suffixes like "Jr.".
+
+    >>> normalize_name("Luka Dončić")
+    'luka doncic'
+    >>> normalize_name("Jaren Jackson Jr.")
+    'jaren jackson'
+    """
+    tokens = _tokens(name)
+    if len(tokens) > 1 and tokens[-1] in SUFFIXES:
+        tokens = tokens[:-1]
+    return ' '.join(tokens)
+
+
+def name_suffix(name: str) -> str:
+    """ The generational suffix of a name ('jr', 'ii', ...), or '' if it has none.
+
+    >>> name_suffix("Gary Payton II")
+    'ii'
+    """
+    tokens = _tokens(name)
+    return tokens[-1] if len(tokens) > 1 and tokens[-1] in SUFFIXES else ''
+
+
+def _tokens(name):
+    name = unicodedata.normalize('NFKD', str(name))
+    name = ''.join(c for c in name if not unicodedata.combining(c)).lower()
+    return _PUNCTUATION.sub(' ', name.replace("'", '').replace('.', '')).split()
+
+
+def trigrams(key: str) -> set:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class PlayerNameIndex:
+    """ Trigram inverted index over player names with ranked fuzzy lookups.
+
+    Candidates are gathered from the postings of the query's trigrams in one
+    `bincount`, pre-ranked by Dice similarity, and only the best few are re-scored
+    with difflib, so a lookup does not touch every name in the index. Exact hits are
+    tried as written, then case-insensitively, then normalized; names sharing a
+    normalized key (e.g. "Tim Hardaway" and "Tim Hardaway Jr.") are ranked by
+    whether their suffix agrees with the query's.
+    """
+
+    def __init__(self, names: Iterable[str]):
+        self.names = list(dict.fromkeys(names))
+        self.keys = [normalize_name(name) for name in self.names]
+        self.suffixes = [name_suffix(name) for name in self.names]
+        self._raw = {name: i for i, name in enumerate(self.names)}
+        self._folded = {}
+        for i, name in enumerate(self.names):
+            self._folded.setdefault(str(name).strip().casefold(), i)
+        self._exact = defaultdict(list)
+        postings = defaultdict(list)
+        sizes = []
+        for i, key in enumerate(self.keys):
+            self._exact[key].append(i)
+            grams = trigrams(key)
+            sizes.append(len(grams))
+            for gram in grams:
+                postings[gram].append(i)
+        self._postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+        self._sizes = np.array(sizes, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def search(self, query: str, k: int = 5, cutoff: float = 0.6) -> List[Tuple[str, float]]:
+        """ Top-k `(name, score)` matches for `query`, best first; scores are in [0, 1].
+        """
+        key = normalize_name(query)
+        if not key or not self.names:
+            return []
+        if key in self._exact:
+            literal = self._raw.get(query, self._folded.get(str(query).strip().casefold()))
+            suffix = name_suffix(query)
+            ranked = sorted(self._exact[key], key=lambda i: (i != literal, self.suffixes[i] != suffix))
+            return [(self.names[i], 1.0) for i in ranked[:k]]
+
+        grams = trigrams(key)
+        hits = [self._postings[gram] for gram in grams if gram in self._postings]
+        if not hits:
+            return []
+        overlap = np.bincount(np.concatenate(hits), minlength=len(self.names))
+        dice = 2.0 * overlap / (len(grams) + self._sizes)
+
+        # Pre-rank by trigram similarity, then re-score a short list with difflib
+        shortlist = max(4 * k, 20)
+        if shortlist < len(dice):
+            candidates = np.argpartition(-dice, shortlist)[:shortlist]
+        else:
+            candidates = np.arange(len(dice))
+        candidates = candidates[overlap[candidates] > 0]
+
+        matcher = difflib.SequenceMatcher(b=key, autojunk=False)
+        scored = []
+        for i in candidates:
+            matcher.set_seq1(self.keys[i])
+            score = matcher.ratio()
+            if score >= cutoff:
+                scored.append((score, dice[i], self.names[i]))
+        scored.sort(key=lambda item: (-item[0], -item[1]))
+        return [(name, float(score)) for score, _, name in scored[:k]]
+
+    def best_match(self, query: str, cutoff: float = 0.6) -> Optional[str]:
+        """ Closest name to `query`, or None if nothing clears the cutoff.
+        """
+        matches = self.search(query, k=1, cutoff=cutoff)
+        return matches[0][0] if matches else None
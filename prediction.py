@@ -0,0 +1,297 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import RidgeClassifier
+from sklearn.preprocessing import MinMaxScaler
+
+from dataset_cache import derived_cache
+from feature_selection import select_features
+from feature_store import ROLLING_WINDOW, RollingFeatureStore, rolling_means
+from snapshot_store import snapshot_store
+
+
+GAMES_CSV = os.environ.get('NBA_GAMES_CSV', './nba_games.csv')
+MODEL_PATH = os.environ.get('NBA_MODEL_PATH', './models/game_outcome.npz')
+MODEL_FORMAT = 1
+
+# Columns the notebook never feeds to the model
+REMOVED_COLUMNS = ["season", "date", "won", "target", "team", "team_opp"]
+# Predictors chosen by the notebook's forward selection over the merged frame, minus
+# target_10_x / target_10_y: a rolling mean of *next-game* results leaks the label
+PREDICTORS = [
+    'blk%', 'usg%', 'trb_max', 'ftr_max', 'orb%_max', 'usg%_max', 'orb_opp', 'tov_opp',
+    'usg%_opp', 'fga_max_opp', 'ast_max_opp', 'fg_10_x', 'usg%_10_x', '+/-_max_10_x',
+    'usg%_opp_10_x', 'orb_max_opp_10_x', '+/-_max_opp_10_x', 'home_next', 'ts%_10_y',
+    'usg%_10_y', '3p_max_10_y', 'ortg_max_10_y', 'fga_opp_10_y', 'pts_opp_10_y',
+    'usg%_opp_10_y', '+/-_max_opp_10_y', 'ts%_max_opp_10_y', 'ortg_max_opp_10_y',
+]
+# nba.com tricodes whose basketball-reference codes (used by the training data) differ
+TEAM_ALIASES = {'PHX': 'PHO', 'BKN': 'BRK', 'CHA': 'CHO'}
+
+
+def load_games(path: str = GAMES_CSV) -> pd.DataFrame:
+    """ Game log (one row per team per game) sorted by date, with the next-game `target`.
+
+    The target is 1/0 when the team won/lost its next game, and 2 when there is no next
+    game yet. Columns with missing values are dropped, as in the notebook.
+    """
+    df = pd.read_csv(path, index_col=0)
+    df = df.sort_values("date").reset_index(drop=True)
+    df = df.drop(columns=["mp.1", "mp_opp.1", "index_opp"], errors="ignore")
+    df["target"] = df.groupby("team")["won"].shift(-1).fillna(2).astype(int)
+    nulls = df.isnull().sum()
+    return df.loc[:, nulls[nulls == 0].index].copy()
+
+
+def feature_columns(df: pd.DataFrame) -> List[str]:
+    return [column for column in df.columns if column not in REMOVED_COLUMNS]
+
+
+def rolled_columns(df: pd.DataFrame) -> List[str]:
+    """ Columns the rolling form is computed over: every numeric column but `target` (see PREDICTORS).
+    """
+    return [column for column in df.select_dtypes(include=[np.number]).columns if column != "target"]
+
+
+def add_rolling_features(df: pd.DataFrame, window: int = ROLLING_WINDOW) -> Tuple[pd.DataFrame, List[str]]:
+    """ Append each team's `window`-game rolling means within a season (`<col>_10`).
+
+    Rows without a full window are dropped.
+    """
+    rolling = rolling_means(df, rolled_columns(df), window)
+    return pd.concat([df, rolling], axis=1).dropna(), list(rolling.columns)
+
+
+def add_next_game(df: pd.DataFrame) -> pd.DataFrame:
+    """ Where, against whom and when each team plays next (NaN for its latest game).
+    """
+    following = df.groupby("team")[["home", "team_opp", "date"]].shift(-1)
+    return df.assign(home_next=following["home"], team_opp_next=following["team_opp"],
+                     date_next=following["date"])
+
+
+def build_training_frame(df: pd.DataFrame, rolling_cols: List[str]) -> pd.DataFrame:
+    """ Each game joined with the opponent's rolling form going into the next game.
+
+    Columns from the team's side of the merge get `_x`, the opponent's `_y`.
+    """
+    return df.merge(df[rolling_cols + ["team_opp_next", "date_next", "team"]],
+                    left_on=["team", "date_next"], right_on=["team_opp_next", "date_next"])
+
+
+def prepare(games: pd.DataFrame) -> Tuple[pd.DataFrame, List[str], MinMaxScaler]:
+    """ Scaled game log with rolling and next-game columns, its rolling columns and the scaler.
+    """
+    df = games.copy()
+    scaled = feature_columns(df)
+    scaler = MinMaxScaler()
+    df[scaled] = scaler.fit_transform(df[scaled])
+    df, rolling_cols = add_rolling_features(df)
+    return add_next_game(df), rolling_cols, scaler
+
+
+class GameOutcomeModel:
+    """ The notebook's RidgeClassifier, reduced to arrays for fast scoring.
+
+    A matchup's feature vector combines the home team's latest game row (its stats
+    and `_x` rolling form), the away team's rolling form (`_y`) and `home_next`,
+    the same layout the model was trained on. The latest rows are stored
+    per team, so `predict_many` is a gather plus one matrix product for the whole slate.
+    """
+
+    def __init__(self, coef, intercept, classes, predictors: Sequence[str], teams: Sequence[str],
+                 base_columns: Sequence[str], team_features, scaler_columns: Sequence[str] = (),
+                 scaler_min=(), scaler_scale=(), trained_at: float = None):
+        self.coef = np.atleast_2d(np.asarray(coef, float))
+        self.intercept = np.atleast_1d(np.asarray(intercept, float))
+        self.classes = np.asarray(classes)
+        self.predictors = list(predictors)
+        self.teams = list(teams)
+        self.base_columns = list(base_columns)
+        self.team_features = np.asarray(team_features, float)
+        self.scaler_columns = list(scaler_columns)
+        self.scaler_min = np.asarray(scaler_min, float)
+        self.scaler_scale = np.asarray(scaler_scale, float)
+        self.trained_at = trained_at or time.time()
+
+        self._team_index = {team: i for i, team in enumerate(self.teams)}
+        base_index = {column: i for i, column in enumerate(self.base_columns)}
+        self._home_position = None
+        own_positions, own_columns, opp_positions, opp_columns = [], [], [], []
+        for position, predictor in enumerate(self.predictors):
+            if predictor == 'home_next':
+                self._home_position = position
+            elif predictor.endswith('_y'):
+                opp_positions.append(position)
+                opp_columns.append(base_index[predictor[:-2]])
+            else:
+                own_positions.append(position)
+                own_columns.append(base_index[predictor[:-2] if predictor.endswith('_x') else predictor])
+        self._own_positions, self._own_columns = np.array(own_positions, int), np.array(own_columns, int)
+        self._opp_positions, self._opp_columns = np.array(opp_positions, int), np.array(opp_columns, int)
+
+    @property
+    def version(self) -> str:
+        digest = hashlib.sha1()
+        for array in (self.coef, self.intercept, self.team_features):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        digest.update(json.dumps([self.predictors, self.teams]).encode('utf-8'))
+        return digest.hexdigest()[:12]
+
+    def team_id(self, team: str) -> Optional[int]:
+        return self._team_index.get(TEAM_ALIASES.get(team, team))
+
+    def features(self, home: Sequence[int], away: Sequence[int]) -> np.ndarray:
+        """ Feature matrix for (home, away) team-index pairs, in `predictors` order.
+        """
+        home, away = np.asarray(home, int), np.asarray(away, int)
+        X = np.empty((len(home), len(self.predictors)))
+        X[:, self._own_positions] = self.team_features[home[:, None], self._own_columns]
+        X[:, self._opp_positions] = self.team_features[away[:, None], self._opp_columns]
+        if self._home_position is not None:
+            X[:, self._home_position] = 1.0
+        return X
+
+    @property
+    def store_columns(self) -> List[str]:
+        """ Game-log columns a RollingFeatureStore must track to serve this model.
+        """
+        suffix = f"_{ROLLING_WINDOW}"
+        return sorted({column[:-len(suffix)] if column.endswith(suffix) else column
+                       for column in self.base_columns})
+
+    def feature_store(self, games: pd.DataFrame) -> RollingFeatureStore:
+        """ Rolling-feature store backfilled from a raw game log, scaled like the training data.
+        """
+        return RollingFeatureStore.from_games(games, self.store_columns, ROLLING_WINDOW,
+                                              self.scaler_columns, self.scaler_min, self.scaler_scale)
+
+    def refresh(self, store: RollingFeatureStore) -> 'GameOutcomeModel':
+        """ Same model, scoring from the store's current team features.
+        """
+        teams, team_features = store.team_features(self.base_columns)
+        return GameOutcomeModel(self.coef, self.intercept, self.classes, self.predictors, teams,
+                                self.base_columns, team_features, self.scaler_columns,
+                                self.scaler_min, self.scaler_scale, self.trained_at)
+
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        return X @ self.coef.T + self.intercept
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        scores = self.decision_function(X)
+        if scores.shape[1] == 1:
+            return self.classes[(scores[:, 0] > 0).astype(int)]
+        return self.classes[scores.argmax(axis=1)]
+
+    def predict_many(self, matchups: Iterable[Tuple[str, str]]) -> List[Optional[str]]:
+        """ Predicted winner of each (home, away) tricode pair; None for a team the model does not know.
+        """
+        matchups = list(matchups)
+        ids = [(self.team_id(home), self.team_id(away)) for home, away in matchups]
+        known = [i for i, (home, away) in enumerate(ids) if home is not None and away is not None]
+        winners = [None] * len(matchups)
+        if known:
+            home_wins = self.predict(self.features([ids[i][0] for i in known], [ids[i][1] for i in known]))
+            for i, won in zip(known, home_wins):
+                home, away = matchups[i]
+                winners[i] = home if won == 1 else away
+        return winners
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, model: RidgeClassifier, predictors: Sequence[str],
+                   scaler: Optional[MinMaxScaler] = None, scaled_columns: Sequence[str] = ()) -> 'GameOutcomeModel':
+        """ Build from a fitted classifier and the prepared game log it was trained on.
+        """
+        base_columns = sorted({p[:-2] if p.endswith(('_x', '_y')) else p
+                               for p in predictors if p != 'home_next'})
+        latest = df.groupby("team").tail(1).set_index("team")
+        return cls(model.coef_, model.intercept_, model.classes_, predictors,
+                   list(latest.index), base_columns, latest[base_columns].to_numpy(float),
+                   scaler_columns=scaled_columns,
+                   scaler_min=scaler.min_ if scaler is not None else (),
+                   scaler_scale=scaler.scale_ if scaler is not None else ())
+
+    def save(self, path: str = MODEL_PATH) -> str:
+        """ Write the model as a single .npz artifact (atomically) and return its version.
+        """
+        meta = {'format': MODEL_FORMAT, 'version': self.version, 'trained_at': self.trained_at,
+                'predictors': self.predictors, 'teams': self.teams, 'base_columns': self.base_columns,
+                'scaler_columns': self.scaler_columns, 'classes': self.classes.tolist()}
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.npz')
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, meta=np.array(json.dumps(meta)), coef=self.coef, intercept=self.intercept,
+                     team_features=self.team_features, scaler_min=self.scaler_min,
+                     scaler_scale=self.scaler_scale)
+        os.replace(tmp_path, path)
+        return self.version
+
+    @classmethod
+    def load(cls, path: str = MODEL_PATH) -> 'GameOutcomeModel':
+        with np.load(path, allow_pickle=False) as artifact:
+            meta = json.loads(str(artifact['meta']))
+            if meta.get('format') != MODEL_FORMAT:
+                raise ValueError(f"Unsupported model artifact format: {meta.get('format')}")
+            return cls(artifact['coef'], artifact['intercept'], meta['classes'], meta['predictors'],
+                       meta['teams'], meta['base_columns'], artifact['team_features'],
+                       meta['scaler_columns'], artifact['scaler_min'], artifact['scaler_scale'],
+                       meta['trained_at'])
+
+
+def candidate_columns(full: pd.DataFrame) -> List[str]:
+    """ Columns of the merged frame the notebook's feature selection chooses from.
+    """
+    return [column for column in full.select_dtypes(include=[np.number]).columns
+            if column not in REMOVED_COLUMNS]
+
+
+def train(path: str = GAMES_CSV, predictors: Optional[Sequence[str]] = PREDICTORS, alpha: float = 1.0,
+          n_features: int = 30) -> GameOutcomeModel:
+    """ Rerun the notebook pipeline on a game log and fit the classifier on every merged game.
+
+    With `predictors=None` the predictors are re-selected first (forward selection of
+    `n_features`, scored with 3-fold time-series CV, as in the notebook).
+    """
+    games = load_games(path)
+    df, rolling_cols, scaler = prepare(games)
+    full = build_training_frame(df, rolling_cols)
+    if predictors is None:
+        predictors = select_features(full, candidate_columns(full), n_features=n_features, alpha=alpha).predictors
+    model = RidgeClassifier(alpha=alpha).fit(full[list(predictors)], full["target"])
+    return GameOutcomeModel.from_frame(df, model, predictors, scaler, feature_columns(games))
+
+
+def get_model(path: str = MODEL_PATH) -> Optional[GameOutcomeModel]:
+    """ The shared model from `path`, reloaded when the artifact changes; None if there is none.
+    """
+    try:
+        version = snapshot_store.version(path)
+    except OSError:
+        return None
+    return derived_cache.get(('game_outcome_model', os.path.abspath(path)), version,
+                             lambda: GameOutcomeModel.load(path))
+
+
+def predict_many(matchups: Iterable[Tuple[str, str]], path: str = MODEL_PATH) -> List[Optional[str]]:
+    """ Predicted winners for a slate of (home, away) tricodes; None where no prediction is available.
+    """
+    matchups = list(matchups)
+    model = get_model(path)
+    if model is None:
+        return [None] * len(matchups)
+    return model.predict_many(matchups)
+
+
+if __name__ == '__main__':
+    import sys
+    # python prediction.py [games.csv] [artifact.npz] [--select]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    trained = train(args[0] if args else GAMES_CSV,
+                    predictors=None if '--select' in sys.argv else PREDICTORS)
+    print(f"Saved model {trained.save(args[1] if len(args) > 1 else MODEL_PATH)}")
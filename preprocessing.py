@@ -0,0 +1,39 @@
+from typing import Optional
+
+import pandas as pd
+
+from dataset_cache import derived_cache
+
+
+MIN_MINUTES = 5
+STAT_COLUMNS = ['Age', 'G', 'GS', 'MP', 'FG', 'FGA', 'FG%', '3P', '3PA', '3P%', '2P', '2PA', '2P%',
+                'eFG%', 'FT', 'FTA', 'FT%', 'ORB', 'DRB', 'TRB', 'AST', 'STL', 'BLK', 'TOV', 'PF', 'PTS']
+CATEGORICAL_COLUMNS = ['Pos', 'Tm']
+
+
+def clean_season_stats(df: pd.DataFrame, min_minutes: float = MIN_MINUTES) -> pd.DataFrame:
+    """ Players with more than `min_minutes` per game, one row each, with typed columns.
+
+    A player listed more than once was traded, and only their `TOT` row is kept; this is
+    one `duplicated` pass over the filtered rows. Stat columns (percentages included)
+    are numeric, with unparseable values as NaN, and `Pos`/`Tm` are categorical.
+    The input frame is not modified.
+    """
+    minutes = pd.to_numeric(df['MP'], errors='coerce')
+    rows = df.loc[minutes > min_minutes]
+    traded = rows['Player'].duplicated(keep=False)
+    rows = rows.loc[~traded | (rows['Tm'] == 'TOT')]
+
+    typed = {column: pd.to_numeric(rows[column], errors='coerce') for column in STAT_COLUMNS if column in rows}
+    typed.update({column: rows[column].astype('category') for column in CATEGORICAL_COLUMNS if column in rows})
+    return rows.assign(**typed)
+
+
+def preprocess_data(df: pd.DataFrame, version: Optional[str] = None) -> pd.DataFrame:
+    """ The cleaned season frame of `df`, shared per dataset `version` (built uncached without one).
+
+    Every page and chart gets the same cached frame, so treat it as read-only.
+    """
+    if version is None:
+        return clean_season_stats(df)
+    return derived_cache.get('preprocessed_data', version, lambda: clean_season_stats(df))
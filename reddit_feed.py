@@ -0,0 +1,71 @@
+import os
+from dataclasses import dataclass
+from typing import List, Tuple, Union
+
+from s3_reader import MAX_WORKERS, LocalS3Client, ObjectCache, list_objects, object_cache
+
+
+REDDIT_BUCKET = 'ash-dcsc-project'
+SUMMARY_PREFIX = 'NBA_Live_Data/Reddit_Posts_Summarized/'
+# Local mode serves this directory as the bucket, with the same key layout as S3
+REDDIT_LOCAL_DIR = os.environ.get('NBA_REDDIT_DIR', 'Sample_Data')
+
+
+@dataclass(frozen=True)
+class RedditPost:
+    """ One discussion of the weekly feed: the post joined with its generated summary.
+    """
+    key: str
+    title: str
+    summary: str
+    upvotes: Union[int, str]  # as published when it is not a plain count (e.g. "1.2k")
+    author: str
+
+
+def _upvotes(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return '' if value is None else value
+
+
+def feed_pairs(listing: List[dict], prefix: str = SUMMARY_PREFIX) -> List[Tuple[dict, dict]]:
+    """ (summary, post) listing entries, in key order; summaries whose post is missing are skipped.
+    """
+    by_key = {item['Key']: item for item in listing}
+    post_prefix = prefix.replace('Reddit_Posts_Summarized', 'Reddit_Posts')
+    pairs = []
+    for key, item in by_key.items():
+        # Skip the folder marker some uploaders create
+        if not key.startswith(prefix) or key == prefix:
+            continue
+        post = by_key.get(post_prefix + key[len(prefix):])
+        if post is not None:
+            pairs.append((item, post))
+    return pairs
+
+
+def load_reddit_feed(s3, bucket: str = REDDIT_BUCKET, prefix: str = SUMMARY_PREFIX,
+                     cache: ObjectCache = object_cache, max_workers: int = MAX_WORKERS) -> List[RedditPost]:
+    """ The weekly feed as typed records: one listing, then every summary and post fetched at once.
+
+    A single listing under the common `Reddit_Posts` prefix covers both folders. All
+    objects go through the shared ObjectCache, so only those whose ETag changed since
+    any session last loaded them are downloaded, concurrently.
+    """
+    listing = list_objects(s3, bucket, prefix.replace('Reddit_Posts_Summarized/', 'Reddit_Posts'))
+    pairs = feed_pairs(listing, prefix)
+    contents = dict(cache.read(s3, bucket, [item for pair in pairs for item in pair], max_workers))
+    posts = []
+    for summary, post in pairs:
+        summary_data, post_data = contents[summary['Key']], contents[post['Key']]
+        posts.append(RedditPost(summary['Key'], str(post_data.get('Title', '')),
+                                str(summary_data.get('summary', '')),
+                                _upvotes(post_data.get('Upvotes')), str(post_data.get('Author', ''))))
+    return posts
+
+
+def local_feed_client(folder: str = REDDIT_LOCAL_DIR) -> Tuple[LocalS3Client, str]:
+    """ (client, bucket) serving a local directory laid out like the feed bucket.
+    """
+    return LocalS3Client(os.path.dirname(os.path.normpath(folder)) or '.'), os.path.basename(os.path.normpath(folder))
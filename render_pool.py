@@ -0,0 +1,87 @@
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable
+
+from chart_cache import encode_figure
+
+
+RENDER_WORKERS = int(os.environ.get('NBA_RENDER_WORKERS', min(4, os.cpu_count() or 1)))
+
+
+def _init_worker():
+    # Workers never show a window; select Agg before anything imports pyplot
+    os.environ['MPLBACKEND'] = 'Agg'
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _render(func, args, kwargs, fmt):
+    return encode_figure(func(*args, **kwargs), fmt)
+
+
+class RenderPool:
+    """ Renders matplotlib figures in a pool of worker processes and returns encoded images.
+
+    `submit(func, *args)` queues `func(*args)` (a module-level function returning a
+    figure) and returns a Future of the encoded image bytes. At most `max_pending`
+    jobs are queued or running; further submits block until a slot frees up, so a
+    burst of users cannot queue unbounded work. Each worker has its own interpreter
+    and pyplot state, so charts render in parallel across cores. With `workers=0`
+    jobs render inline on the calling thread instead.
+    """
+
+    def __init__(self, workers: int = RENDER_WORKERS, max_pending: int = None, fmt: str = 'png'):
+        self.workers = workers
+        self.max_pending = max_pending or max(1, workers) * 4
+        self.fmt = fmt
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        if self.workers <= 0:
+            return self._inline(func, args, kwargs)
+        self._slots.acquire()
+        try:
+            try:
+                future = self._pool().submit(_render, func, args, kwargs, self.fmt)
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM-killed); start a fresh pool once
+                self.shutdown()
+                future = self._pool().submit(_render, func, args, kwargs, self.fmt)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking the multithreaded Streamlit server is not safe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker)
+            return self._executor
+
+    def _inline(self, func, args, kwargs):
+        future = Future()
+        try:
+            future.set_result(_render(func, args, kwargs, self.fmt))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+render_pool = RenderPool()
+atexit.register(render_pool.shutdown)
@@ -0,0 +1,176 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
+from io import BytesIO
+from typing import Iterable, Iterator, List, Tuple
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+
+MAX_WORKERS = 8
+
+
+@lru_cache(maxsize=4)
+def s3_client(aws_access_key_id=None, aws_secret_access_key=None):
+    """ Shared boto3 S3 client (clients are thread-safe), pooled for MAX_WORKERS concurrent gets.
+    """
+    return boto3.client('s3', aws_access_key_id=aws_access_key_id,
+                        aws_secret_access_key=aws_secret_access_key,
+                        config=Config(max_pool_connections=MAX_WORKERS))
+
+
+class LocalS3Client:
+    """ Filesystem-backed stand-in for the two S3 calls the app makes.
+
+    Bucket `b` is the directory `<root>/b` and keys are '/'-separated paths under it.
+    Listings page like S3's (sorted keys, MaxKeys, continuation tokens, an ETag and
+    LastModified per object, derived from the file's mtime and size), a `Delimiter`
+    rolls subfolders up into CommonPrefixes, and `latency` adds a per-call delay, so
+    readers can be exercised and benchmarked offline.
+    """
+
+    def __init__(self, root: str = '.', latency: float = 0.0):
+        self.root = root
+        self.latency = latency
+
+    def list_objects_v2(self, Bucket, Prefix='', Delimiter=None, MaxKeys=1000, ContinuationToken=None, **kwargs):
+        time.sleep(self.latency)
+        bucket_dir = os.path.join(self.root, Bucket)
+        keys = set()
+        for dirpath, _, filenames in os.walk(bucket_dir):
+            for filename in filenames:
+                key = os.path.relpath(os.path.join(dirpath, filename), bucket_dir).replace(os.sep, '/')
+                if not key.startswith(Prefix):
+                    continue
+                # As on S3, keys with the delimiter after the prefix roll up into one common prefix
+                cut = key.find(Delimiter, len(Prefix)) if Delimiter else -1
+                keys.add(key[:cut + len(Delimiter)] if cut >= 0 else key)
+        keys = sorted(keys)
+        if ContinuationToken:
+            keys = [key for key in keys if key > ContinuationToken]
+        page = keys[:MaxKeys]
+        objects = [key for key in page if not (Delimiter and key.endswith(Delimiter))]
+        prefixes = [key for key in page if Delimiter and key.endswith(Delimiter)]
+        response = {'KeyCount': len(page), 'IsTruncated': len(keys) > MaxKeys}
+        if objects:
+            response['Contents'] = [self._describe(bucket_dir, key) for key in objects]
+        if prefixes:
+            response['CommonPrefixes'] = [{'Prefix': prefix} for prefix in prefixes]
+        if response['IsTruncated']:
+            response['NextContinuationToken'] = page[-1]
+        return response
+
+    def get_object(self, Bucket, Key, **kwargs):
+        time.sleep(self.latency)
+        try:
+            with open(os.path.join(self.root, Bucket, Key), 'rb') as f:
+                data = f.read()
+        except OSError:
+            raise ClientError({'Error': {'Code': 'NoSuchKey', 'Message': Key}}, 'GetObject')
+        return dict(self._describe(os.path.join(self.root, Bucket), Key),
+                    Body=BytesIO(data), ContentLength=len(data))
+
+    @staticmethod
+    def _describe(bucket_dir, key):
+        stat = os.stat(os.path.join(bucket_dir, key))
+        return {'Key': key, 'Size': stat.st_size, 'ETag': f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"',
+                'LastModified': datetime.fromtimestamp(stat.st_mtime, timezone.utc)}
+
+
+def list_objects(s3, bucket: str, prefix: str = '', suffix: str = '', delimiter: str = None) -> List[dict]:
+    """ Listing entry (Key, ETag, LastModified, Size) of every object under `prefix` ending with
+    `suffix`, following continuation tokens past 1,000 keys. With a `delimiter` ('/'), only the
+    objects directly under `prefix` are listed, not those in its subfolders.
+    """
+    objects = []
+    kwargs = {'Bucket': bucket, 'Prefix': prefix}
+    if delimiter:
+        kwargs['Delimiter'] = delimiter
+    while True:
+        response = s3.list_objects_v2(**kwargs)
+        objects.extend(item for item in response.get('Contents', []) if item['Key'].endswith(suffix))
+        if not response.get('IsTruncated'):
+            return objects
+        kwargs['ContinuationToken'] = response['NextContinuationToken']
+
+
+def get_json(s3, bucket: str, key: str):
+    obj = s3.get_object(Bucket=bucket, Key=key)
+    return json.loads(obj['Body'].read().decode('utf-8'))
+
+
+class ObjectCache:
+    """ Parsed JSON objects keyed by (bucket, key), revalidated against S3 listings.
+
+    `read` takes the entries of a fresh listing and only downloads the objects whose
+    ETag (or LastModified, when there is no ETag) differs from the cached copy; the
+    rest are served from memory. So a refresh costs one listing plus one GET per
+    changed object. Entries with neither field cannot be revalidated and are fetched
+    on every read. Payloads are shared between sessions and must not be modified.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self.gets = 0
+        self.hits = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def read(self, s3, bucket: str, objects: Iterable[dict],
+             max_workers: int = MAX_WORKERS) -> Iterator[Tuple[str, dict]]:
+        """ Yield (key, parsed JSON) for each listing entry, in order.
+        """
+        objects = list(objects)
+        cached, stale = {}, []
+        with self._lock:
+            for item in objects:
+                entry = self._entries.get((bucket, item['Key']))
+                version = self._version(item)
+                if entry is not None and version is not None and entry[0] == version:
+                    self._entries.move_to_end((bucket, item['Key']))
+                    cached[item['Key']] = entry[1]
+                else:
+                    stale.append(item)
+            self.hits += len(cached)
+            self.gets += len(stale)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(stale)))) as pool:
+            fetched = pool.map(lambda item: get_json(s3, bucket, item['Key']), stale)
+            stale = iter(stale)
+            for item in objects:
+                key = item['Key']
+                if key in cached:
+                    yield key, cached[key]
+                    continue
+                data = next(fetched)
+                self._remember(bucket, next(stale), data)
+                yield key, data
+
+    def _remember(self, bucket, item, data):
+        version = self._version(item)
+        if version is None:
+            return
+        with self._lock:
+            self._entries[(bucket, item['Key'])] = (version, data)
+            self._entries.move_to_end((bucket, item['Key']))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @staticmethod
+    def _version(item):
+        # Entries without an ETag or LastModified cannot be revalidated, so they are never cached
+        if item.get('ETag'):
+            return item['ETag']
+        if item.get('LastModified') is not None:
+            return str(item['LastModified'])
+        return None
+
+
+object_cache = ObjectCache()
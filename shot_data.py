@@ -0,0 +1,192 @@
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import requests
+from nba_api.stats.endpoints import playercareerstats, shotchartdetail
+from nba_api.stats.library.http import NBAStatsHTTP
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from snapshot_store import SNAPSHOT_DIR
+
+
+MAX_WORKERS = 6
+SHOT_STORE_DIR = os.environ.get('NBA_SHOT_STORE_DIR', os.path.join(SNAPSHOT_DIR, 'shots'))
+
+logger = logging.getLogger(__name__)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def retrying_session(pool_size: int = MAX_WORKERS) -> requests.Session:
+    """ Session that retries transient stats.nba.com errors, with one pooled connection per worker.
+    """
+    session = requests.Session()
+    retries = Retry(total=5, backoff_factor=1, status_forcelist=[502, 503, 504])
+    session.mount('https://', HTTPAdapter(max_retries=retries, pool_connections=pool_size,
+                                          pool_maxsize=pool_size))
+    return session
+
+
+def shared_session() -> requests.Session:
+    """ The process-wide retrying session, also installed as nba_api's stats session.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = retrying_session()
+                NBAStatsHTTP.set_session(_session)
+    return _session
+
+
+def _fetch_one(player_id, team_id, season, timeout, date_from=None):
+    started = time.perf_counter()
+    shot_data = shotchartdetail.ShotChartDetail(
+        team_id=team_id, player_id=player_id,
+        context_measure_simple='FGA',
+        season_nullable=season,
+        date_from_nullable=date_from.strftime('%m/%d/%Y') if date_from else '',
+        timeout=timeout
+    )
+    frame = shot_data.get_data_frames()[0]
+    timing = {'season': season, 'team_id': team_id, 'rows': len(frame),
+              'seconds': time.perf_counter() - started}
+    return frame, timing
+
+
+def season_is_complete(season: str, today: date = None) -> bool:
+    """ Whether a 'YYYY-YY' season is over, i.e. its shot data can no longer change.
+    """
+    today = today or date.today()
+    return today >= date(int(season[:4]) + 1, 7, 1)
+
+
+class ShotDataStore:
+    """ On-disk shot data partitioned by (player_id, team_id, season), plus career tables.
+
+    Completed seasons are fetched once and kept forever. A current-season partition
+    is revalidated at most every `current_ttl` seconds. Revalidation only asks
+    stats.nba.com for games from the last stored GAME_DATE on, and replaces that last
+    day's rows with the fresh ones. Partitions are memory-mapped Arrow files.
+    """
+
+    def __init__(self, root: str = SHOT_STORE_DIR, current_ttl: float = 15 * 60,
+                 career_ttl: float = 6 * 60 * 60):
+        self.root = root
+        self.current_ttl = current_ttl
+        self.career_ttl = career_ttl
+
+    def get_shot_data(self, player_id: int, team_ids: list, seasons: list,
+                      max_workers: int = MAX_WORKERS, timeout: float = 240):
+        """ Every (season, team) shot chart of a player, served from the store where possible.
+
+        Missing or stale partitions are fetched concurrently on a bounded thread pool over
+        the shared retrying session. Returns the frames concatenated once, in (season, team)
+        order, and a list of per-request timings. Each timing has a 'source': 'store', 'full', 'incremental', or 'stale' when
+        a current-season refresh failed and the stored partition was served instead.
+        """
+        frames, timings, pending = [], [], []
+        now = time.time()
+        for season in seasons:
+            for team in team_ids:
+                frame, meta = self._read(self._partition_path(player_id, team, season))
+                frames.append(frame)
+                timings.append({'season': season, 'team_id': team,
+                                'rows': 0 if frame is None else len(frame),
+                                'seconds': 0.0, 'source': 'store'})
+                if frame is not None and (meta.get('complete') == 'true'
+                                          or now - float(meta.get('checked_at', 0)) < self.current_ttl):
+                    continue
+                date_from = None
+                if frame is not None and len(frame):
+                    date_from = datetime.strptime(frame['GAME_DATE'].max(), '%Y%m%d').date()
+                pending.append((len(frames) - 1, team, season, date_from))
+
+        if pending:
+            shared_session()
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as pool:
+                futures = [pool.submit(_fetch_one, player_id, team, season, timeout, date_from)
+                           for _, team, season, date_from in pending]
+                for (i, team, season, date_from), future in zip(pending, futures):
+                    try:
+                        frame, timing = future.result()
+                    except Exception:
+                        # Upstream failed: a stale current-season partition beats no chart at all
+                        if frames[i] is None:
+                            raise
+                        timings[i]['source'] = 'stale'
+                        continue
+                    if date_from is not None:
+                        # Keep stored games before the last stored day; the fetch covers that day onwards
+                        previous = frames[i]
+                        kept = previous[previous['GAME_DATE'] < date_from.strftime('%Y%m%d')]
+                        frame = pd.concat([kept, frame], ignore_index=True)
+                    self._write(self._partition_path(player_id, team, season), frame,
+                                {'checked_at': str(time.time()),
+                                 'complete': 'true' if season_is_complete(season) else 'false'})
+                    frames[i] = frame
+                    timings[i] = dict(timing, source='incremental' if date_from is not None else 'full')
+
+        if not frames:
+            return pd.DataFrame(), timings
+        return pd.concat(frames, ignore_index=True), timings
+
+    def get_player_career(self, player_id: int) -> pd.DataFrame:
+        """ A player's career table, refetched at most every `career_ttl` seconds.
+        """
+        path = os.path.join(self.root, 'careers', f"{player_id}.arrow")
+        frame, meta = self._read(path)
+        if frame is not None and time.time() - float(meta.get('checked_at', 0)) < self.career_ttl:
+            return frame
+        shared_session()
+        frame = playercareerstats.PlayerCareerStats(player_id=player_id).get_data_frames()[0]
+        self._write(path, frame, {'checked_at': str(time.time())})
+        return frame
+
+    def _partition_path(self, player_id, team_id, season):
+        return os.path.join(self.root, str(player_id), str(team_id), f"{season}.arrow")
+
+    @staticmethod
+    def _read(path):
+        if not os.path.exists(path):
+            return None, {}
+        try:
+            table = feather.read_table(path, memory_map=True)
+        except (OSError, pa.ArrowInvalid):
+            return None, {}
+        meta = {key.decode('utf-8'): value.decode('utf-8')
+                for key, value in (table.schema.metadata or {}).items()
+                if key != b'pandas'}
+        return table.to_pandas(split_blocks=True), meta
+
+    @staticmethod
+    def _write(path, frame, meta):
+        # Best effort: the data is returned either way, only the cache write is skipped
+        tmp_path = None
+        try:
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            metadata = dict(table.schema.metadata or {})
+            metadata.update({key.encode('utf-8'): value.encode('utf-8') for key, value in meta.items()})
+            table = table.replace_schema_metadata(metadata)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            os.close(fd)
+            feather.write_feather(table, tmp_path, compression='uncompressed')
+            os.replace(tmp_path, path)
+        except (OSError, pa.ArrowException) as error:
+            logger.warning("Not caching %s: %s", path, error)
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+shot_store = ShotDataStore()
@@ -0,0 +1,154 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from typing import Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+
+SNAPSHOT_DIR = os.environ.get('NBA_SNAPSHOT_DIR', './.snapshots')
+PER_GAME_CSV = './Sample_Data/NBA_2024_per_game.csv'
+IMAGES_CSV = './Sample_Data/images_data.csv'
+
+_VERSION_KEY = b'snapshot_version'
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotStore:
+    """ Columnar, memory-mapped snapshots of the CSVs and API datasets the pages read.
+
+    Each source CSV is parsed once into an uncompressed Arrow IPC (Feather v2) file, which
+    readers memory-map so column access is zero-copy and shared between processes.
+    A snapshot records the stat of the file it was built from and is rebuilt as soon as
+    that file changes.
+    """
+
+    def __init__(self, root: str = SNAPSHOT_DIR):
+        self.root = root
+        self._tables = {}
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def version(source_path: str) -> str:
+        """ Version id of a source file, derived from its modification time and size.
+        """
+        stat = os.stat(source_path)
+        return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+    def table(self, source_path: str) -> pa.Table:
+        """ Memory-mapped Arrow table for a CSV, (re)built if the CSV changed.
+        """
+        key = os.path.abspath(source_path)
+        version = self.version(source_path)
+        cached = self._tables.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        with self._lock:
+            cached = self._tables.get(key)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            snapshot_path = self._snapshot_path(key)
+            table = self._open(snapshot_path, version)
+            if table is None:
+                table = pa.Table.from_pandas(pd.read_csv(source_path), preserve_index=False)
+                table = self._write(snapshot_path, table, version)
+            self._tables[key] = (version, table)
+            self._frames.pop(key, None)
+            return table
+
+    def read_csv(self, source_path: str) -> pd.DataFrame:
+        """ Drop-in for `pd.read_csv` that parses each version of the file only once.
+
+        The frame is shared between callers, so it must be treated as read-only.
+        """
+        key = os.path.abspath(source_path)
+        version = self.version(source_path)
+        cached = self._frames.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        df = self.table(source_path).to_pandas(split_blocks=True)
+        self._frames[key] = (version, df)
+        return df
+
+    def put_frame(self, name: str, df: pd.DataFrame, version: str) -> None:
+        """ Persist a DataFrame that did not come from a file (e.g. the API dataset).
+
+        Best effort: a frame Arrow cannot convert (e.g. a column of mixed types) is only
+        kept in memory.
+        """
+        snapshot_path = os.path.join(self.root, f"{name}.arrow")
+        try:
+            table = self._write(snapshot_path, pa.Table.from_pandas(df, preserve_index=False), version)
+        except pa.ArrowException as error:
+            logger.warning("Not persisting snapshot %r: %s", name, error)
+            table = None
+        with self._lock:
+            if table is not None:
+                self._tables[name] = (version, table)
+            self._frames[name] = (version, df)
+
+    def get_frame(self, name: str) -> Optional[Tuple[pd.DataFrame, str]]:
+        """ Load a frame stored with `put_frame`, returning `(df, version)` or None.
+        """
+        cached = self._frames.get(name)
+        if cached is not None:
+            return cached[1], cached[0]
+        snapshot_path = os.path.join(self.root, f"{name}.arrow")
+        table = self._open(snapshot_path)
+        if table is None:
+            return None
+        version = table.schema.metadata[_VERSION_KEY].decode('utf-8')
+        df = table.to_pandas(split_blocks=True)
+        with self._lock:
+            self._tables[name] = (version, table)
+            self._frames[name] = (version, df)
+        return df, version
+
+    def _snapshot_path(self, source_key):
+        stem = os.path.splitext(os.path.basename(source_key))[0]
+        digest = hashlib.sha1(source_key.encode('utf-8')).hexdigest()[:8]
+        return os.path.join(self.root, f"{stem}-{digest}.arrow")
+
+    @staticmethod
+    def _open(snapshot_path, version=None):
+        if not os.path.exists(snapshot_path):
+            return None
+        try:
+            table = feather.read_table(snapshot_path, memory_map=True)
+        except (OSError, pa.ArrowInvalid):
+            return None
+        metadata = table.schema.metadata or {}
+        if _VERSION_KEY not in metadata:
+            return None
+        if version is not None and metadata[_VERSION_KEY].decode('utf-8') != version:
+            return None
+        return table
+
+    def _write(self, snapshot_path, table, version):
+        metadata = dict(table.schema.metadata or {})
+        metadata[_VERSION_KEY] = version.encode('utf-8')
+        table = table.replace_schema_metadata(metadata)
+        tmp_path = None
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            # Write to a temp file and rename, so readers never map a half-written snapshot
+            fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+            os.close(fd)
+            # Uncompressed so that memory-mapped reads stay zero-copy
+            feather.write_feather(table, tmp_path, compression='uncompressed')
+            os.replace(tmp_path, snapshot_path)
+        except (OSError, pa.ArrowException):
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return table
+        return self._open(snapshot_path, version) or table
+
+
+snapshot_store = SnapshotStore()
@@ -0,0 +1,76 @@
+from typing import Iterable, Optional
+
+from dataset_cache import derived_cache
+from player_search import PlayerNameIndex, name_suffix, normalize_name
+
+
+class StaticIndex:
+    """ Hash lookups over one of nba_api's static lists (players or teams).
+
+    Records are indexed by id and by every alias field: the exact string first, then
+    case-insensitively, then normalized (no accents, punctuation or suffixes). Records
+    sharing a normalized name (e.g. "Tim Hardaway" and "Tim Hardaway Jr.") are told
+    apart by the query's suffix. The fuzzy name index only runs when none of these hit.
+    """
+
+    def __init__(self, records: Iterable[dict], aliases=('full_name',)):
+        self.records = list(records)
+        self.by_id = {record['id']: record for record in self.records}
+        self._exact = {}
+        self._folded = {}
+        self._normalized = {}
+        for record in self.records:
+            for field in aliases:
+                value = record.get(field)
+                if not value:
+                    continue
+                self._exact.setdefault(value, record)
+                self._folded.setdefault(value.casefold(), record)
+                self._normalized.setdefault(normalize_name(value), []).append((name_suffix(value), record))
+        self.all_ids = [record['id'] for record in self.records]
+        self.active_ids = [record['id'] for record in self.records if record.get('is_active', True)]
+        self._names = None
+
+    def find(self, name: str, fuzzy: bool = True) -> Optional[dict]:
+        """ Record matching `name`, or None if there is no (close enough) match.
+        """
+        record = self._exact.get(name)
+        if record is None:
+            record = self._folded.get(name.strip().casefold())
+        if record is None:
+            candidates = self._normalized.get(normalize_name(name))
+            if candidates:
+                suffix = name_suffix(name)
+                record = next((r for s, r in candidates if s == suffix), None)
+                if record is None:
+                    # nba_api lists some sons without their suffix (e.g. Glen Rice Jr. as
+                    # "Glen Rice"): a suffixed query then means the most recent player
+                    pick = max if suffix else min
+                    record = pick((r for _, r in candidates), key=lambda r: r['id'])
+        if record is None and fuzzy:
+            if self._names is None:
+                self._names = PlayerNameIndex(self._exact)
+            matches = self._names.search(name, k=5)
+            if matches:
+                # Among near-equal matches, prefer active players to historical ones
+                best = matches[0][1]
+                close = [self._exact[match] for match, score in matches if score >= best - 0.1]
+                record = next((r for r in close if r.get('is_active', True)), close[0])
+        return record
+
+
+def player_index() -> StaticIndex:
+    """ Index over every NBA player known to nba_api, built on first use.
+    """
+    from nba_api.stats.static import players
+    return derived_cache.get('static_players', 'static',
+                             lambda: StaticIndex(players.get_players()))
+
+
+def team_index() -> StaticIndex:
+    """ Index over NBA teams by full name, abbreviation and nickname, built on first use.
+    """
+    from nba_api.stats.static import teams
+    return derived_cache.get('static_teams', 'static',
+                             lambda: StaticIndex(teams.get_teams(),
+                                                 aliases=('full_name', 'abbreviation', 'nickname')))
@@ -0,0 +1,22 @@
+import json
+import os
+import sys
+
+import pytest
+
+# The app modules live at the repository root, next to streamlit_app.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def bucket(tmp_path):
+    """ (root, bucket) of a LocalS3Client bucket: 25 game JSONs, a stray text file and an archived game.
+    """
+    root = tmp_path / 'bucket'
+    (root / 'games').mkdir(parents=True)
+    (root / 'games' / 'archive').mkdir()
+    for i in range(25):
+        (root / 'games' / f"game_{i:02d}.json").write_text(json.dumps({'id': i}))
+    (root / 'games' / 'notes.txt').write_text('not a game')
+    (root / 'games' / 'archive' / 'old.json').write_text(json.dumps({'id': -1}))
+    return str(tmp_path), 'bucket'
@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import RidgeClassifier
+
+from backtest import backtest
+
+
+def test_matches_notebook_loop():
+    rng = np.random.default_rng(2)
+    predictors = [f"f{i}" for i in range(6)]
+    data = pd.DataFrame(rng.normal(size=(500, len(predictors))), columns=predictors)
+    data["season"] = rng.choice(np.arange(2015, 2021), size=len(data))
+    data["target"] = (data["f0"] - data["f1"] + rng.normal(size=len(data)) > 0).astype(int)
+
+    # The notebook's loop: train on every season before, predict the season
+    all_predictions = []
+    seasons = sorted(data["season"].unique())
+    for i in range(2, len(seasons)):
+        train = data[data["season"] < seasons[i]]
+        test = data[data["season"] == seasons[i]]
+        model = RidgeClassifier(alpha=1).fit(train[predictors], train["target"])
+        preds = pd.Series(model.predict(test[predictors]), index=test.index)
+        all_predictions.append(pd.concat([test["target"], preds], axis=1).set_axis(["actual", "prediction"], axis=1))
+    expected = pd.concat(all_predictions).sort_index()
+
+    for max_workers in (0, 2):
+        result = backtest(data, predictors, max_workers=max_workers)
+        pd.testing.assert_frame_equal(result.predictions.sort_index(), expected, check_dtype=False)
+        assert [fold['season'] for fold in result.folds] == seasons[2:]
+        assert sum(fold['test_rows'] for fold in result.folds) == len(expected)
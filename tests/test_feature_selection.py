@@ -0,0 +1,23 @@
+import numpy as np
+import pandas as pd
+from sklearn.feature_selection import SequentialFeatureSelector
+from sklearn.linear_model import RidgeClassifier
+from sklearn.model_selection import TimeSeriesSplit
+
+from feature_selection import select_features
+
+
+def test_matches_sequential_feature_selector():
+    rng = np.random.default_rng(1)
+    columns = [f"f{i}" for i in range(14)]
+    data = pd.DataFrame(rng.normal(size=(600, len(columns))), columns=columns)
+    signal = data[columns[:5]].to_numpy() @ np.array([1.5, -1.0, 0.8, 0.6, -0.4])
+    data["target"] = (signal + rng.normal(scale=1.0, size=len(data)) > 0).astype(int)
+
+    result = select_features(data, columns, n_features=6, max_workers=4)
+    reference = SequentialFeatureSelector(RidgeClassifier(alpha=1.0), n_features_to_select=6,
+                                          direction='forward', cv=TimeSeriesSplit(3))
+    reference.fit(data[columns], data["target"])
+
+    assert set(result.predictors) == set(np.array(columns)[reference.get_support()])
+    assert len(result.scores) == 6
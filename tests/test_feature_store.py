@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from feature_store import RollingFeatureStore, rolling_means
+
+
+def game_log(rng):
+    rows = []
+    # Two seasons; "BOS" has too few games in the second one for a full window
+    for season, games in ((2021, {'BOS': 20, 'LAL': 14, 'NYK': 17}), (2022, {'BOS': 4, 'LAL': 12, 'NYK': 11})):
+        for team, count in games.items():
+            for game in range(count):
+                rows.append({'team': team, 'season': season, 'date': f"{season}-{game:03d}",
+                             'pts': rng.normal(110, 10), 'ast': rng.normal(25, 4), 'fg%': rng.uniform(0.4, 0.5)})
+    return pd.DataFrame(rows).sample(frac=1, random_state=0).reset_index(drop=True)
+
+
+def test_matches_per_row_loop():
+    rng = np.random.default_rng(3)
+    games = game_log(rng)
+    columns, window = ['pts', 'ast', 'fg%'], 10
+    scaler = {'scaler_columns': ['pts', 'ast'], 'scaler_min': [-0.5, -1.0], 'scaler_scale': [0.01, 0.04]}
+
+    # The notebook's definition, one row at a time: the mean of the team's last `window`
+    # games this season, and the latest row of each team that had a full window
+    ordered = games.sort_values("date", kind="stable")
+    scale = np.array([0.01, 0.04, 1.0]), np.array([-0.5, -1.0, 0.0])
+    history, expected_means, expected_features = {}, {}, {}
+    for i, row in ordered.iterrows():
+        values = row[columns].to_numpy(float) * scale[0] + scale[1]
+        past = history.setdefault((row['team'], row['season']), [])
+        past.append(values)
+        if len(past) >= window:
+            means = np.mean(past[-window:], axis=0)
+            expected_means[i] = means
+            expected_features[row['team']] = np.concatenate([values, means])
+
+    # Like from_games, the vectorized pass runs over the date-sorted log
+    scaled = ordered.copy()
+    scaled[columns] = ordered[columns].to_numpy(float) * scale[0] + scale[1]
+    means = rolling_means(scaled, columns, window)
+    assert list(means.columns) == [f"{column}_{window}" for column in columns]
+    assert means.notna().all(axis=1).sum() == len(expected_means)
+    for i, expected in expected_means.items():
+        np.testing.assert_allclose(means.loc[i].to_numpy(float), expected)
+
+    batch = RollingFeatureStore.from_games(games, columns, window, **scaler)
+    incremental = RollingFeatureStore(columns, window, **scaler)
+    incremental.update_many(games)
+    # A backfill of the first half, then the rest one game at a time
+    resumed = RollingFeatureStore.from_games(ordered.iloc[:len(ordered) // 2], columns, window, **scaler)
+    resumed.update_many(ordered.iloc[len(ordered) // 2:])
+    for store in (batch, incremental, resumed):
+        assert sorted(store.teams) == sorted(expected_features)
+        for team, expected in expected_features.items():
+            np.testing.assert_allclose(store.feature_vector(team).to_numpy(), expected)
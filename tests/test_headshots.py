@@ -0,0 +1,86 @@
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from headshots import MANIFEST_NAME, HeadshotDownloader
+
+
+IMAGES = {player_id: b'\x89PNG fake headshot %d' % player_id for player_id in range(1, 21)}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """ Serves IMAGES like the CDN: ETags, 304 on If-None-Match, 403 for unknown ids.
+    """
+    requests = []
+
+    def do_GET(self):
+        player_id = int(self.path.strip('/').split('.')[0])
+        self.requests.append((player_id, self.headers.get('If-None-Match')))
+        data = IMAGES.get(player_id)
+        if data is None:
+            self.send_response(403)
+            self.end_headers()
+            return
+        etag = '"%s"' % hashlib.md5(data).hexdigest()
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.requests = []
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}/{{id}}.png"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_download_skip_and_revalidate(server, tmp_path):
+    ids = list(IMAGES) + [999]
+    downloader = HeadshotDownloader(str(tmp_path), server, max_workers=8)
+
+    report = downloader.download_all(ids)
+    assert report.count('downloaded') == len(IMAGES)
+    assert report.count('missing') == 1
+    assert report.bytes == sum(len(data) for data in IMAGES.values())
+    for player_id, data in IMAGES.items():
+        assert (tmp_path / f"{player_id}.png").read_bytes() == data
+    assert (tmp_path / MANIFEST_NAME).exists()
+
+    # A second run within max_age does no requests at all, even from a fresh downloader
+    _Handler.requests = []
+    report = HeadshotDownloader(str(tmp_path), server).download_all(ids)
+    assert report.count('skipped') == len(ids)
+    assert _Handler.requests == []
+
+    # max_age=0 revalidates with conditional requests and rewrites nothing
+    report = HeadshotDownloader(str(tmp_path), server).download_all(ids, max_age=0)
+    assert report.count('unchanged') == len(IMAGES)
+    assert all(etag for player_id, etag in _Handler.requests if player_id in IMAGES)
+
+
+def test_changed_image_is_downloaded_again(server, tmp_path):
+    downloader = HeadshotDownloader(str(tmp_path), server)
+    downloader.download_all([1])
+    IMAGES[1], original = b'\x89PNG new headshot', IMAGES[1]
+    try:
+        report = HeadshotDownloader(str(tmp_path), server).download_all([1], max_age=0)
+    finally:
+        IMAGES[1] = original
+    assert report.count('downloaded') == 1
+    assert (tmp_path / "1.png").read_bytes() == b'\x89PNG new headshot'
@@ -0,0 +1,32 @@
+import json
+import os
+import time
+
+from s3_reader import LocalS3Client, ObjectCache, list_objects
+
+
+def test_object_cache_only_refetches_changed_objects(bucket):
+    root, name = bucket
+    s3 = LocalS3Client(root)
+    cache = ObjectCache()
+    listing = list_objects(s3, name, 'games/', '.json', delimiter='/')
+    first = list(cache.read(s3, name, listing))
+    assert [key for key, _ in first] == [item['Key'] for item in listing]
+    assert cache.gets == 25 and cache.hits == 0
+
+    path = os.path.join(root, name, 'games', 'game_03.json')
+    with open(path, 'w') as f:
+        json.dump({'id': 3, 'score': 101}, f)
+    os.utime(path, ns=(time.time_ns() + 10**9,) * 2)
+    second = dict(cache.read(s3, name, list_objects(s3, name, 'games/', '.json', delimiter='/')))
+    assert cache.gets == 26 and cache.hits == 24
+    assert second['games/game_03.json'] == {'id': 3, 'score': 101}
+
+
+def test_entries_without_version_are_always_fetched(bucket):
+    root, name = bucket
+    s3 = LocalS3Client(root)
+    cache = ObjectCache()
+    for _ in range(2):
+        list(cache.read(s3, name, [{'Key': 'games/game_00.json'}]))
+    assert cache.gets == 2 and cache.hits == 0
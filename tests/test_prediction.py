@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import RidgeClassifier
+
+from prediction import GameOutcomeModel
+
+
+PREDICTORS = ['pts_x', 'ast_x', 'pts_10_x', 'pts_y', 'pts_10_y', 'ast_10_y', 'home_next']
+BASE_COLUMNS = ['ast', 'ast_10', 'pts', 'pts_10']
+
+
+@pytest.fixture
+def fitted():
+    rng = np.random.default_rng(0)
+    teams = [f"T{i:02d}" for i in range(30)]
+    # Two rows per team, so the model must read each team's latest one
+    log = pd.DataFrame(rng.random((60, len(BASE_COLUMNS))), columns=BASE_COLUMNS)
+    log.insert(0, 'team', teams * 2)
+    X = rng.random((400, len(PREDICTORS)))
+    y = (X @ rng.normal(size=len(PREDICTORS)) + rng.normal(scale=0.1, size=400) > 0).astype(int)
+    classifier = RidgeClassifier(alpha=1.0).fit(X, y)
+    return log, classifier, GameOutcomeModel.from_frame(log, classifier, PREDICTORS)
+
+
+def _sklearn_rows(log, home, away):
+    latest = log.groupby('team').tail(1).set_index('team')
+    rows = []
+    for h, a in zip(home, away):
+        row = {f"{c}_x": latest.at[h, c] for c in BASE_COLUMNS}
+        row.update({f"{c}_y": latest.at[a, c] for c in BASE_COLUMNS})
+        row['home_next'] = 1.0
+        rows.append([row[p] for p in PREDICTORS])
+    return np.array(rows)
+
+
+def test_scores_match_ridge_classifier(fitted):
+    log, classifier, model = fitted
+    home, away = ['T00', 'T05', 'T17', 'T29'], ['T01', 'T12', 'T03', 'T00']
+    X = _sklearn_rows(log, home, away)
+    ids = model.features([model.team_id(t) for t in home], [model.team_id(t) for t in away])
+    np.testing.assert_allclose(ids, X)
+    np.testing.assert_allclose(model.decision_function(X)[:, 0], classifier.decision_function(X))
+    np.testing.assert_array_equal(model.predict(X), classifier.predict(X))
+
+    expected = [h if won == 1 else a for h, a, won in zip(home, away, classifier.predict(X))]
+    assert model.predict_many(zip(home, away)) == expected
+
+
+def test_unknown_teams_and_round_trip(fitted, tmp_path):
+    _, _, model = fitted
+    assert model.predict_many([('T00', 'XXX'), ('T00', 'T01')])[0] is None
+
+    path = str(tmp_path / 'model.npz')
+    version = model.save(path)
+    loaded = GameOutcomeModel.load(path)
+    assert loaded.version == version
+    matchups = [('T02', 'T03'), ('T10', 'T20')]
+    assert loaded.predict_many(matchups) == model.predict_many(matchups)
@@ -0,0 +1,60 @@
+import threading
+import time
+
+import pytest
+from botocore.exceptions import ClientError
+
+from s3_reader import LocalS3Client, ObjectCache, get_json, list_objects
+
+
+def test_listing_pages_and_filters(bucket):
+    root, name = bucket
+    s3 = LocalS3Client(root)
+    page = s3.list_objects_v2(Bucket=name, Prefix='games/', MaxKeys=10)
+    assert page['IsTruncated'] and page['KeyCount'] == 10
+
+    keys = [item['Key'] for item in list_objects(s3, name, 'games/', '.json')]
+    assert len(keys) == 26 and keys == sorted(keys)
+    assert all(item.get('ETag') for item in list_objects(s3, name, 'games/'))
+
+    top_level = [item['Key'] for item in list_objects(s3, name, 'games/', '.json', delimiter='/')]
+    assert 'games/archive/old.json' not in top_level and len(top_level) == 25
+    response = s3.list_objects_v2(Bucket=name, Prefix='games/', Delimiter='/')
+    assert response['CommonPrefixes'] == [{'Prefix': 'games/archive/'}]
+
+
+def test_missing_key_raises_no_such_key(bucket):
+    root, name = bucket
+    with pytest.raises(ClientError) as error:
+        get_json(LocalS3Client(root), name, 'games/missing.json')
+    assert error.value.response['Error']['Code'] == 'NoSuchKey'
+
+
+class CountingClient(LocalS3Client):
+    """ LocalS3Client whose gets sleep, recording the most that were ever in flight at once.
+    """
+
+    def __init__(self, root):
+        super().__init__(root)
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def get_object(self, Bucket, Key, **kwargs):
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            time.sleep(0.02)
+            return super().get_object(Bucket=Bucket, Key=Key, **kwargs)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def test_reads_are_concurrent(bucket):
+    root, name = bucket
+    s3 = CountingClient(root)
+    listing = list_objects(s3, name, 'games/', '.json', delimiter='/')
+    assert len(dict(ObjectCache().read(s3, name, listing, max_workers=8))) == 25
+    assert 1 < s3.peak <= 8
@@ -0,0 +1,17 @@
+import pytest
+
+from static_index import player_index
+
+
+@pytest.mark.parametrize("query, full_name, player_id", [
+    ("Tim Hardaway Jr", "Tim Hardaway Jr.", 203501),
+    ("Tim Hardaway", "Tim Hardaway", 896),
+    ("Larry Nance Jr", "Larry Nance Jr.", 1626204),
+    ("Larry Nance", "Larry Nance", 77685),
+    ("Glen Rice Jr", "Glen Rice", 203318),
+    ("Glen Rice", "Glen Rice", 779),
+    ("jaren jackson jr", "Jaren Jackson Jr.", 1628991),
+])
+def test_suffixes_pick_the_right_generation(query, full_name, player_id):
+    record = player_index().find(query)
+    assert (record['full_name'], record['id']) == (full_name, player_id)